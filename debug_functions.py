@@ -31,17 +31,16 @@ async def main():
 
             # Test your function
             print("\nTesting get_tasks_past_due_date...")
-            tasks = await get_tasks_past_due_date(session)
+            tasks = [task async for task in get_tasks_past_due_date(session)]
 
             print(f"✅ Found {len(tasks)} tasks past due date")
 
             # Print details
             for task in tasks:
-                assignees = [assignee.full_name for assignee in
-                             task.assignees] if task.assignees else []
-                print(f"  - Task: {task.title}")
-                print(f"    Due: {task.due_date}")
-                print(f"    Status: {task.status}")
+                assignees = [assignee["full_name"] for assignee in task["assignees"]]
+                print(f"  - Task: {task['title']}")
+                print(f"    Due: {task['due_date']}")
+                print(f"    Status: {task['status']}")
                 print(f"    Assignees: {assignees}")
                 print()
 
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+import pytest
+from langchain_core.tools import InjectedToolArg
+from typing_extensions import Self
+
+from zentro.intelligence_manager import utils
+
+
+async def _tool(
+    project_id: int,
+    session: Annotated[str | None, InjectedToolArg] = None,
+    user_id: Annotated[int | None, InjectedToolArg] = None,
+    creator_id: int | None = None,
+) -> None:
+    """Dummy tool used to check parameter injection."""
+
+
+class _FakeSession:
+    """Stands in for an AsyncSession opened by the session factory."""
+
+    def __init__(self) -> None:
+        self.committed = False
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def commit(self) -> None:
+        self.committed = True
+
+    async def rollback(self) -> None:
+        return None
+
+
+async def _record(
+    project_id: int,
+    session: Annotated[object | None, InjectedToolArg] = None,
+    user_id: Annotated[int | None, InjectedToolArg] = None,
+) -> tuple[object | None, int | None]:
+    """Tool that returns what the wrapper passed in."""
+    return session, user_id
+
+
+@pytest.fixture
+def factory_session(monkeypatch: pytest.MonkeyPatch) -> _FakeSession:
+    """
+    Make the wrapper open a fake session.
+
+    :param monkeypatch: pytest monkeypatch.
+    :return: the session the wrapper will open.
+    """
+    session = _FakeSession()
+    monkeypatch.setattr(utils, "get_db_session_factory", lambda: lambda: session)
+    return session
+
+
+@pytest.mark.anyio
+async def test_with_db_session_injects_missing_args(
+    factory_session: _FakeSession,
+) -> None:
+    """Tests that session and user_id are filled in when not passed."""
+    utils.set_current_user_id(7)
+    try:
+        session, user_id = await utils.with_db_session(_record)(project_id=1)
+    finally:
+        utils.set_current_user_id(None)
+
+    assert session is factory_session
+    assert factory_session.committed
+    assert user_id == 7
+
+
+@pytest.mark.anyio
+async def test_with_db_session_keeps_explicit_args(
+    factory_session: _FakeSession,
+) -> None:
+    """Tests that session and user_id passed by the caller are left alone."""
+    own_session = _FakeSession()
+
+    utils.set_current_user_id(7)
+    try:
+        session, user_id = await utils.with_db_session(_record)(
+            project_id=1,
+            session=own_session,
+            user_id=3,
+        )
+    finally:
+        utils.set_current_user_id(None)
+
+    assert session is own_session
+    assert not own_session.committed
+    assert not factory_session.committed
+    assert user_id == 3
+
+
+def test_injected_params_resolves_postponed_annotations() -> None:
+    """Tests that string annotations still mark ``user_id`` as injected."""
+    assert utils._injected_params(_tool) == ("user_id",)
@@ -0,0 +1,184 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from redis.asyncio import ConnectionPool
+from starlette import status
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from zentro.project_manager import security
+from zentro.services.redis.cache import (
+    ResponseCacheMiddleware,
+    invalidate_response_cache,
+)
+
+ETAG = 'W/"0123456789abcdef"'
+
+
+def _make_app(redis_pool: ConnectionPool) -> Starlette:
+    """
+    Build a tiny app behind the cache that counts how often it is reached.
+
+    :param redis_pool: pool the middleware reads from.
+    :return: the application.
+    """
+
+    async def list_items(request: Request) -> Response:
+        request.app.state.calls += 1
+        return JSONResponse(
+            [{"id": 1}],
+            headers={"ETag": ETAG, "Cache-Control": "private, no-cache"},
+        )
+
+    async def create_item(request: Request) -> Response:
+        return Response(status_code=status.HTTP_201_CREATED)
+
+    app = Starlette(
+        routes=[
+            Route("/api/projects", list_items, methods=["GET"]),
+            Route("/api/projects", create_item, methods=["POST"]),
+        ],
+    )
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        prefix="/api/projects",
+        rules=[(r"/api/projects", 30)],
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://fe"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.state.redis_pool = redis_pool
+    app.state.calls = 0
+    return app
+
+
+def _client(app: Starlette) -> AsyncClient:
+    token = security.create_access_token({"sub": "1"})
+    return AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+
+@pytest.mark.anyio
+async def test_miss_then_hit(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that the second identical GET is served from the cache.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    app = _make_app(fake_redis_pool)
+    async with _client(app) as client:
+        first = await client.get("/api/projects")
+        second = await client.get("/api/projects")
+
+    assert first.status_code == status.HTTP_200_OK
+    assert "x-cache" not in first.headers
+    assert second.status_code == status.HTTP_200_OK
+    assert second.headers["x-cache"] == "hit"
+    assert second.headers["etag"] == ETAG
+    assert second.json() == first.json()
+    assert app.state.calls == 1
+
+
+@pytest.mark.anyio
+async def test_hit_with_matching_etag_is_304(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that a cached entry honours If-None-Match.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    app = _make_app(fake_redis_pool)
+    async with _client(app) as client:
+        await client.get("/api/projects")
+        response = await client.get(
+            "/api/projects",
+            headers={"If-None-Match": ETAG},
+        )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["x-cache"] == "hit"
+    assert response.headers["etag"] == ETAG
+    assert response.content == b""
+    assert app.state.calls == 1
+
+
+@pytest.mark.anyio
+async def test_write_invalidates(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that a successful write under the prefix drops cached entries.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    app = _make_app(fake_redis_pool)
+    async with _client(app) as client:
+        await client.get("/api/projects")
+        created = await client.post("/api/projects")
+        response = await client.get("/api/projects")
+
+    assert created.status_code == status.HTTP_201_CREATED
+    assert "x-cache" not in response.headers
+    assert app.state.calls == 2
+
+
+@pytest.mark.anyio
+async def test_invalidate_response_cache(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that writes made outside the prefix can drop cached entries.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    app = _make_app(fake_redis_pool)
+    async with _client(app) as client:
+        await client.get("/api/projects")
+        await invalidate_response_cache(fake_redis_pool)
+        response = await client.get("/api/projects")
+
+    assert "x-cache" not in response.headers
+    assert app.state.calls == 2
+
+
+@pytest.mark.anyio
+async def test_hit_has_cors_headers(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that cache hits still pass through CORS.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    app = _make_app(fake_redis_pool)
+    async with _client(app) as client:
+        await client.get("/api/projects", headers={"Origin": "http://fe"})
+        response = await client.get("/api/projects", headers={"Origin": "http://fe"})
+
+    assert response.headers["x-cache"] == "hit"
+    assert response.headers["access-control-allow-origin"] == "http://fe"
+
+
+@pytest.mark.anyio
+async def test_head_and_preflight_keep_cache(fake_redis_pool: ConnectionPool) -> None:
+    """
+    Tests that requests which don't write leave cached entries in place.
+
+    :param fake_redis_pool: fake redis pool.
+    """
+    app = _make_app(fake_redis_pool)
+    async with _client(app) as client:
+        await client.get("/api/projects")
+        await client.head("/api/projects")
+        await client.options(
+            "/api/projects",
+            headers={
+                "Origin": "http://fe",
+                "Access-Control-Request-Method": "GET",
+            },
+        )
+        response = await client.get("/api/projects")
+
+    assert response.headers["x-cache"] == "hit"
+    assert app.state.calls == 2
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+import pytest
+from jwt import PyJWTError
+
+from zentro.auth import dependencies
+from zentro.auth.dependencies import (
+    CurrentUser,
+    get_current_user_claims,
+    invalidate_cached_user,
+)
+from zentro.project_manager import security
+from zentro.project_manager.enums import UserRole
+
+
+def test_decode_token_caches_payload() -> None:
+    """Tests that decoding the same token twice reuses the cached payload."""
+    token = security.create_access_token(data={"sub": "1"})
+    assert security.decode_token(token) is security.decode_token(token)
+
+
+def test_decode_token_rejects_expired_cached_payload() -> None:
+    """Tests that a cached payload is not reused once the token has expired."""
+    token = security.create_access_token(data={"sub": "1"})
+    payload = security.decode_token(token)
+    payload["exp"] = 0
+
+    with pytest.raises(PyJWTError):
+        security.decode_token(token)
+
+
+def test_decode_token_rejects_invalid_token() -> None:
+    """Tests that a token with a bad signature is rejected."""
+    token = security.create_access_token(
+        data={"sub": "1"},
+        expires_delta=timedelta(minutes=5),
+    )
+    with pytest.raises(PyJWTError):
+        security.decode_token(token + "x")
+
+
+@pytest.mark.anyio
+async def test_current_user_claims_ignore_token_role() -> None:
+    """Tests that the global role comes from the user cache, not the token."""
+    token = security.create_access_token(data={"sub": "7", "role": "admin"})
+    dependencies._role_cache[7] = UserRole.USER
+
+    current_user = await get_current_user_claims(token, session=None)
+
+    assert current_user == CurrentUser(id=7, role=UserRole.USER)
+
+
+def test_invalidate_cached_user_drops_role() -> None:
+    """Tests that invalidating a user forces the next role lookup to the DB."""
+    dependencies._role_cache[7] = UserRole.ADMIN
+
+    invalidate_cached_user(7)
+
+    assert dependencies._role_cache.get(7) is None
+
+
+def test_verify_password_caches_only_successes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that a verified password skips the hash check until it changes."""
+    calls = []
+
+    def fake_verify(plain: str, hashed: str) -> bool:
+        calls.append(plain)
+        return plain == "secret"
+
+    monkeypatch.setattr(security.pwd_context, "verify", fake_verify)
+    security._verified_cache.clear()
+
+    assert security.verify_password("secret", "hash-1")
+    assert security.verify_password("secret", "hash-1")
+    assert not security.verify_password("wrong", "hash-1")
+    assert not security.verify_password("wrong", "hash-1")
+    assert security.verify_password("secret", "hash-2")
+
+    assert calls == ["secret", "wrong", "wrong", "secret"]
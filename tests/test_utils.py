@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from zentro.project_manager.models import Project
+from zentro.utils import NotFound, _ensure_exist
+
+
+@pytest.mark.anyio
+async def test_ensure_exist_passes_for_existing_ids(dbsession: AsyncSession) -> None:
+    """Tests that existing primary keys pass the check."""
+    project = Project(name="existing")
+    dbsession.add(project)
+    await dbsession.flush()
+
+    await _ensure_exist(dbsession, {Project: [project.id, project.id]})
+
+
+@pytest.mark.anyio
+async def test_ensure_exist_reports_missing_id(dbsession: AsyncSession) -> None:
+    """Tests that a missing primary key raises NotFound naming the id."""
+    project = Project(name="existing")
+    dbsession.add(project)
+    await dbsession.flush()
+    missing_id = project.id + 1000
+
+    with pytest.raises(NotFound, match=f"Project with id={missing_id} not found"):
+        await _ensure_exist(dbsession, {Project: [project.id, missing_id]})
+
+
+@pytest.mark.anyio
+async def test_ensure_exist_skips_empty_ids(dbsession: AsyncSession) -> None:
+    """Tests that an empty id list does not hit the database."""
+    await _ensure_exist(dbsession, {Project: []})
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import uvicorn
 
-from zentro.gunicorn_runner import GunicornApplication
+from zentro.gunicorn_runner import GunicornApplication, uvloop
 from zentro.settings import settings
 
 
@@ -45,6 +45,9 @@ def main() -> None:
             reload=settings.reload,
             log_level=settings.log_level.value.lower(),
             factory=True,
+            loop="uvloop" if uvloop is not None else "asyncio",
+            http="httptools",
+            limit_concurrency=settings.limit_concurrency,
         )
     else:
         # We choose gunicorn only if reload
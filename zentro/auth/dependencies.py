@@ -1,65 +1,120 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy import select
+from jwt import PyJWTError
+from sqlalchemy import bindparam, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from zentro.db.dependencies import get_db_session
 from zentro.project_manager import security, services
 from zentro.auth.schemas import UserOut
+from zentro.project_manager.enums import UserRole
 from zentro.project_manager.models import User
+from zentro.utils import TTLCache
 
 # --- OAuth2 Scheme ---
 # This tells FastAPI where to look for the token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/token")
 
 
-async def get_current_user_db(
-    token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_db_session),
-) -> User:  # Note: This returns the SQLAlchemy User model
-    """
-    Dependency that decodes a JWT token and returns the full SQLAlchemy User object.
-    This is used internally when you need access to the user's ID or other database fields.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+_CREDENTIALS_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+# Public user data by id, so hot users skip the DB lookup on every request.
+_user_cache: TTLCache[int, UserOut] = TTLCache(maxsize=5000, ttl=60)
+# Global role by id; the token's 'role' claim can't be revoked, this can.
+_role_cache: TTLCache[int, UserRole] = TTLCache(maxsize=5000, ttl=60)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user from the auth cache; call after any write to that user."""
+    _user_cache.pop(user_id)
+    _role_cache.pop(user_id)
+
+
+def _user_id_from_token(token: str) -> int:
+    """Return the user id stored in the token's 'sub' claim."""
     try:
-        # The 'sub' claim in the JWT should contain the user's ID
-        payload = jwt.decode(
-            token, security.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
+        payload = security.decode_token(token)
         user_id_str = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
-        user_id = int(user_id_str)
-    except (JWTError, ValueError):
-        raise credentials_exception
-
-    # Fetch the full user object from the database
-    stmt = select(User).where(User.id == user_id)
-    result = await session.execute(stmt)
+            raise _CREDENTIALS_EXCEPTION
+        return int(user_id_str)
+    except (PyJWTError, ValueError):
+        raise _CREDENTIALS_EXCEPTION
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """The authenticated user's id and current global role."""
+
+    id: int
+    role: UserRole
+
+
+_GET_USER_BY_ID = lambda_stmt(lambda: select(User).where(User.id == bindparam("user_id")))
+
+
+async def _load_user(session: AsyncSession, user_id: int) -> User:
+    result = await session.execute(_GET_USER_BY_ID, {"user_id": user_id})
     user = result.scalar_one_or_none()
 
     if user is None:
-        raise credentials_exception
+        raise _CREDENTIALS_EXCEPTION
 
     return user
 
 
+async def get_current_user_db(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_db_session),
+) -> User:  # Note: This returns the SQLAlchemy User model
+    """
+    Dependency that decodes a JWT token and returns the full SQLAlchemy User object.
+    This is used internally when you need access to the user's ID or other database fields.
+    """
+    # The 'sub' claim in the JWT should contain the user's ID
+    user_id = _user_id_from_token(token)
+    return await _load_user(session, user_id)
+
+
 async def get_current_user(
-    user: User = Depends(get_current_user_db),
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_db_session),
 ) -> UserOut:
     """
     Dependency that returns the public-facing UserOut model.
     This is what your existing endpoints like /users/me use.
+    Served from a short-lived cache; the DB is only hit on a miss.
+    """
+    user_id = _user_id_from_token(token)
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = UserOut.model_validate(await _load_user(session, user_id))
+        _user_cache[user_id] = user
+    return user
+
+
+async def get_current_user_claims(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_db_session),
+) -> CurrentUser:
+    """
+    Dependency that returns the user's id and global role.
+    The role comes from the DB through a short-lived cache, not from the
+    token's 'role' claim, so a demotion takes effect as soon as
+    invalidate_cached_user runs (on other workers, within the cache TTL)
+    rather than when the token expires.
     """
-    print(
-        "--------------------------- in the get_current_user ---------------------------"
-    )
-    return UserOut.model_validate(user)
+    user_id = _user_id_from_token(token)
+    role = _role_cache.get(user_id)
+    if role is None:
+        role = (await _load_user(session, user_id)).role
+        _role_cache[user_id] = role
+    return CurrentUser(id=user_id, role=role)
@@ -1,43 +1,53 @@
 from __future__ import annotations
 
 import datetime
-from fastapi import APIRouter, Depends
+import time
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from jose import jwt, JWTError
+from jwt import PyJWTError
+from loguru import logger
 
 from zentro.db.dependencies import get_db_session
 from zentro.project_manager import services, security
-from zentro.auth.schemas import Token, UserCreate, UserOut
-from zentro.auth.dependencies import get_current_user
-from functools import wraps
-from typing import Any, cast
+from zentro.auth.schemas import Token, UserCreate, UserOut, UserUpdate
+from zentro.auth.dependencies import get_current_user, invalidate_cached_user
+from zentro.services.redis.cache import invalidate_response_cache
 
 from fastapi import HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from zentro.utils import Conflict, NotFound, ServiceError, F
+router = APIRouter()
 
-def translate_service_errors(fn: F) -> F:
-    """
-    Decorator which translates service exceptions into HTTPExceptions while
-    preserving the wrapped function's signature so FastAPI/OpenAPI behave correctly.
-    """
+_UTC = datetime.timezone.utc
 
-    @wraps(fn)
-    async def wrapper(*args: Any, **kwargs: Any) -> Any:
-        try:
-            # original fn might be async (endpoints are async), so await result
-            return await fn(*args, **kwargs)
-        except NotFound as e:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-        except Conflict as e:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
-        except ServiceError as e:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+# Refresh tokens are only re-issued once they are this close (in seconds)
+# to expiry; until then the client keeps using the one it already has.
+_REFRESH_REISSUE_WINDOW = 24 * 60 * 60
 
-    return cast(F, wrapper)
+_REFRESH_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate refresh token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
-router = APIRouter()
+
+async def _touch_last_login(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: int,
+    when: datetime.datetime,
+) -> None:
+    """Record the login time on its own session, after the response is sent.
+
+    Best effort: the user is already logged in, so failures are only logged.
+    """
+    try:
+        async with session_factory() as session:
+            await services.update_user(session, user_id, last_login=when)
+            await session.commit()
+    except Exception as exc:
+        logger.warning("Could not record last login for user {}: {}", user_id, exc)
+        return
+    invalidate_cached_user(user_id)
 
 
 # -----------------------
@@ -45,6 +55,8 @@ router = APIRouter()
 # -----------------------
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
+    background_tasks: BackgroundTasks,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(get_db_session),
 ):
@@ -61,11 +73,18 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Update last login time
-    await services.update_user(session, user.id, last_login=datetime.datetime.now(tz=datetime.UTC))
+    # Update last login time without holding up the response
+    background_tasks.add_task(
+        _touch_last_login,
+        request.app.state.db_session_factory,
+        user.id,
+        datetime.datetime.now(_UTC),
+    )
 
     # Create tokens
-    access_token = security.create_access_token(data={"sub": str(user.id)})
+    access_token = security.create_access_token(
+        data={"sub": str(user.id), "role": user.role.value}
+    )
     refresh_token = security.create_refresh_token(
         data={"sub": str(user.id), "rtp": user.refresh_token_param}
     )
@@ -83,34 +102,34 @@ async def refresh_access_token(
 ):
     """
     Refreshes an access token using a valid refresh token.
+
+    A new refresh token is only minted when the current one expires within
+    a day; otherwise the incoming refresh token is returned unchanged.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate refresh token",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
     try:
-        payload = jwt.decode(
-            refresh_token, security.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        user_id: int = payload["sub"]
+        payload = security.decode_token(refresh_token)
+        user_id = int(payload["sub"])
         rtp: int = payload["rtp"]
-        if user_id is None or rtp is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        expires_at: float = payload["exp"]
+        if rtp is None:
+            raise _REFRESH_EXCEPTION
+    except (PyJWTError, KeyError, ValueError):
+        raise _REFRESH_EXCEPTION
 
     user = await services.get_user(session, user_id=user_id)
     if not user or user.refresh_token_param != rtp:
         # The refresh token parameter has changed, meaning the token is invalidated
-        raise credentials_exception
+        raise _REFRESH_EXCEPTION
 
     # Create new tokens
-    new_access_token = security.create_access_token(data={"sub": user.id})
-    # Optionally, you can also issue a new refresh token
-    new_refresh_token = security.create_refresh_token(
-        data={"sub": user.id, "rtp": user.refresh_token_param}
+    new_access_token = security.create_access_token(
+        data={"sub": str(user.id), "role": user.role.value}
     )
+    new_refresh_token = refresh_token
+    if expires_at - time.time() <= _REFRESH_REISSUE_WINDOW:
+        new_refresh_token = security.create_refresh_token(
+            data={"sub": str(user.id), "rtp": user.refresh_token_param}
+        )
 
     return {
         "access_token": new_access_token,
@@ -123,7 +142,6 @@ async def refresh_access_token(
 # -----------------------
 
 @router.post("/users/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-@translate_service_errors
 async def register_user(
     payload: UserCreate,
     session: AsyncSession = Depends(get_db_session),
@@ -141,7 +159,6 @@ async def register_user(
 
 
 @router.get("/users/me", response_model=UserOut)
-@translate_service_errors
 async def read_users_me(current_user: UserOut = Depends(get_current_user)):
     """
     Protected endpoint to get the current authenticated user's details.
@@ -150,7 +167,6 @@ async def read_users_me(current_user: UserOut = Depends(get_current_user)):
 
 
 @router.get("/users/{user_id}", response_model=UserOut)
-@translate_service_errors
 async def get_user(
     user_id: int,
     session: AsyncSession = Depends(get_db_session),
@@ -161,10 +177,10 @@ async def get_user(
 
 
 @router.patch("/users/{user_id}", response_model=UserOut)
-@translate_service_errors
 async def patch_user(
     user_id: int,
-    payload: UserCreate,
+    payload: UserUpdate,
+    request: Request,
     session: AsyncSession = Depends(get_db_session),
     current_user: UserOut = Depends(get_current_user), # <-- PROTECTED
 ):
@@ -173,5 +189,12 @@ async def patch_user(
         # You can expand this logic for admin roles.
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operation not permitted")
 
-    data = payload.model_dump(exclude_unset=True)
-    return await services.update_user(session, user_id, **data)
+    data = {field: getattr(payload, field) for field in payload.model_fields_set}
+    if not data:
+        return current_user
+    user = await services.update_user(session, user_id, **data)
+    # Commit before dropping cached project responses, which embed users.
+    await session.commit()
+    invalidate_cached_user(user_id)
+    await invalidate_response_cache(request.app.state.redis_pool)
+    return user
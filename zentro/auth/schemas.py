@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class UserBase(BaseModel):
@@ -14,12 +14,20 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
 
+class UserUpdate(BaseModel):
+    email: Optional[EmailStr] = None
+    full_name: Optional[str] = None
+    active: Optional[bool] = None
+    password: Optional[str] = None
+
 class UserOut(UserBase):
+    # Stored emails were validated on the way in; skip re-validating on output.
+    email: str
+    id: int
     is_verified: bool
     last_login: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     access_token: str
@@ -30,5 +38,4 @@ class TokenData(BaseModel):
     sub: str
     rtp: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
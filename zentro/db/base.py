@@ -1,3 +1,5 @@
+from typing import Any, ClassVar
+
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
 from sqlalchemy.sql.sqltypes import DateTime
@@ -9,6 +11,9 @@ class Base(DeclarativeBase):
     """Base for all models."""
 
     metadata = meta
+    # Server-generated timestamps come back through RETURNING on INSERT and
+    # UPDATE, so a flushed object is complete without a refresh().
+    __mapper_args__: ClassVar[dict[str, Any]] = {"eager_defaults": True}
 
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True),
@@ -0,0 +1,27 @@
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from zentro.settings import settings
+
+
+def make_engine() -> AsyncEngine:
+    """
+    Create the application's database engine.
+
+    Pool sizing and statement caching come from settings, so every engine the
+    app creates is configured the same way.
+    """
+    return create_async_engine(
+        str(settings.db_url),
+        echo=settings.db_echo,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_pre_ping=True,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        query_cache_size=settings.db_query_cache_size,
+        connect_args={
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        },
+    )
@@ -0,0 +1,43 @@
+"""make follow-up created_at timezone aware.
+
+Revision ID: 3c9e1f7a2b64
+Revises: fb88f2600f1c
+Create Date: 2025-11-16 10:42:08.317245
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "3c9e1f7a2b64"
+down_revision = "fb88f2600f1c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.alter_column(
+        "task_follow_ups",
+        "created_at",
+        existing_type=postgresql.TIMESTAMP(),
+        type_=sa.DateTime(timezone=True),
+        server_default=sa.text("now()"),
+        existing_nullable=False,
+        postgresql_using="created_at AT TIME ZONE 'UTC'",
+    )
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.alter_column(
+        "task_follow_ups",
+        "created_at",
+        existing_type=sa.DateTime(timezone=True),
+        type_=postgresql.TIMESTAMP(),
+        server_default=None,
+        existing_nullable=False,
+        postgresql_using="created_at AT TIME ZONE 'UTC'",
+    )
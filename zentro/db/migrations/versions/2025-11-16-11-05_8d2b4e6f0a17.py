@@ -0,0 +1,45 @@
+"""add follow-up status indexes.
+
+Revision ID: 8d2b4e6f0a17
+Revises: 3c9e1f7a2b64
+Create Date: 2025-11-16 11:05:51.904113
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d2b4e6f0a17"
+down_revision = "3c9e1f7a2b64"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.create_index(
+        "task_follow_ups_status_created_at_idx",
+        "task_follow_ups",
+        ["status", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "task_follow_ups_pending_created_at_idx",
+        "task_follow_ups",
+        [sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.drop_index(
+        "task_follow_ups_pending_created_at_idx",
+        table_name="task_follow_ups",
+    )
+    op.drop_index(
+        "task_follow_ups_status_created_at_idx",
+        table_name="task_follow_ups",
+    )
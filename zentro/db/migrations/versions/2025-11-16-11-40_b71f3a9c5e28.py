@@ -0,0 +1,78 @@
+"""add task follow-up stats counters.
+
+Revision ID: b71f3a9c5e28
+Revises: 8d2b4e6f0a17
+Create Date: 2025-11-16 11:40:17.552903
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "b71f3a9c5e28"
+down_revision = "8d2b4e6f0a17"
+branch_labels = None
+depends_on = None
+
+follow_up_status_enum = postgresql.ENUM(
+    "PENDING",
+    "SENT",
+    "ACKNOWLEDGED",
+    name="followupstatus",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.create_table(
+        "task_follow_up_stats",
+        sa.Column("recipient_id", sa.Integer(), nullable=False),
+        sa.Column("status", follow_up_status_enum, nullable=False),
+        sa.Column("n", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("recipient_id", "status"),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_follow_up_stats_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE task_follow_up_stats SET n = n - 1
+                WHERE recipient_id = OLD.recipient_id AND status = OLD.status;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO task_follow_up_stats (recipient_id, status, n)
+                VALUES (NEW.recipient_id, NEW.status, 1)
+                ON CONFLICT (recipient_id, status)
+                DO UPDATE SET n = task_follow_up_stats.n + 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_follow_up_stats_sync
+        AFTER INSERT OR DELETE OR UPDATE OF recipient_id, status ON task_follow_ups
+        FOR EACH ROW EXECUTE FUNCTION task_follow_up_stats_sync()
+        """,
+    )
+    # Backfill the counters from existing rows.
+    op.execute(
+        """
+        INSERT INTO task_follow_up_stats (recipient_id, status, n)
+        SELECT recipient_id, status, count(*)
+        FROM task_follow_ups
+        GROUP BY recipient_id, status
+        """,
+    )
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.execute("DROP TRIGGER IF EXISTS task_follow_up_stats_sync ON task_follow_ups")
+    op.execute("DROP FUNCTION IF EXISTS task_follow_up_stats_sync()")
+    op.drop_table("task_follow_up_stats")
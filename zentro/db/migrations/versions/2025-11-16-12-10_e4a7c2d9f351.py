@@ -0,0 +1,30 @@
+"""add tasks project_id id index.
+
+Revision ID: e4a7c2d9f351
+Revises: b71f3a9c5e28
+Create Date: 2025-11-16 12:10:34.118640
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e4a7c2d9f351"
+down_revision = "b71f3a9c5e28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.create_index(
+        "ix_tasks_project_id_id",
+        "tasks",
+        ["project_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.drop_index("ix_tasks_project_id_id", table_name="tasks")
@@ -0,0 +1,62 @@
+"""store user and project roles as ranked smallints.
+
+Revision ID: 5f0c8b3d1e92
+Revises: e4a7c2d9f351
+Create Date: 2025-11-16 12:40:52.407315
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5f0c8b3d1e92"
+down_revision = "e4a7c2d9f351"
+branch_labels = None
+depends_on = None
+
+PROJECT_ROLES = ("VIEWER", "REPORTER", "DEVELOPER", "PROJECT_MANAGER", "PROJECT_ADMIN")
+USER_ROLES = ("USER", "ADMIN", "SUPER_ADMIN")
+
+
+def _to_rank(column: str, names: tuple) -> str:
+    whens = " ".join(f"WHEN '{name}' THEN {rank}" for rank, name in enumerate(names))
+    return f"CASE {column}::text {whens} END"
+
+
+def _to_name(column: str, names: tuple, enum_type: str) -> str:
+    whens = " ".join(f"WHEN {rank} THEN '{name}'" for rank, name in enumerate(names))
+    return f"(CASE {column} {whens} END)::{enum_type}"
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.execute(
+        "ALTER TABLE project_users ALTER COLUMN role TYPE smallint "
+        f"USING {_to_rank('role', PROJECT_ROLES)}",
+    )
+    op.execute(
+        "ALTER TABLE users ALTER COLUMN role TYPE smallint "
+        f"USING {_to_rank('role', USER_ROLES)}",
+    )
+    op.execute("DROP TYPE projectrole")
+    op.execute("DROP TYPE userrole")
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.execute(
+        "CREATE TYPE projectrole AS ENUM "
+        f"({', '.join(repr(name) for name in reversed(PROJECT_ROLES))})",
+    )
+    op.execute(
+        "CREATE TYPE userrole AS ENUM "
+        f"({', '.join(repr(name) for name in reversed(USER_ROLES))})",
+    )
+    op.execute(
+        "ALTER TABLE project_users ALTER COLUMN role TYPE projectrole "
+        f"USING {_to_name('role', PROJECT_ROLES, 'projectrole')}",
+    )
+    op.execute(
+        "ALTER TABLE users ALTER COLUMN role TYPE userrole "
+        f"USING {_to_name('role', USER_ROLES, 'userrole')}",
+    )
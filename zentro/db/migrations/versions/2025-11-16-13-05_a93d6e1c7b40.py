@@ -0,0 +1,40 @@
+"""null task epic_id when its epic is deleted.
+
+Revision ID: a93d6e1c7b40
+Revises: 5f0c8b3d1e92
+Create Date: 2025-11-16 13:05:11.620493
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a93d6e1c7b40"
+down_revision = "5f0c8b3d1e92"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.drop_constraint("tasks_epic_id_fkey", "tasks", type_="foreignkey")
+    op.create_foreign_key(
+        "tasks_epic_id_fkey",
+        "tasks",
+        "epics",
+        ["epic_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.drop_constraint("tasks_epic_id_fkey", "tasks", type_="foreignkey")
+    op.create_foreign_key(
+        "tasks_epic_id_fkey",
+        "tasks",
+        "epics",
+        ["epic_id"],
+        ["id"],
+    )
@@ -0,0 +1,31 @@
+"""add covering index for a user's project memberships.
+
+Revision ID: c28e5f7a9d13
+Revises: a93d6e1c7b40
+Create Date: 2025-11-16 13:30:47.285116
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c28e5f7a9d13"
+down_revision = "a93d6e1c7b40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.create_index(
+        "ix_project_users_user_project_role",
+        "project_users",
+        ["user_id", "project_id"],
+        unique=False,
+        postgresql_include=["role"],
+    )
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.drop_index("ix_project_users_user_project_role", table_name="project_users")
@@ -0,0 +1,41 @@
+"""replace the task status index with workload-specific ones.
+
+Revision ID: 6d1b9e4f2a87
+Revises: c28e5f7a9d13
+Create Date: 2025-11-16 13:55:12.640193
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6d1b9e4f2a87"
+down_revision = "c28e5f7a9d13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.create_index(
+        "ix_tasks_project_id_status",
+        "tasks",
+        ["project_id", "status"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_open_due_date",
+        "tasks",
+        ["due_date"],
+        unique=False,
+        postgresql_where=sa.text("status != 'DONE'"),
+    )
+    op.drop_index("ix_tasks_status", table_name="tasks")
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.create_index("ix_tasks_status", "tasks", ["status"], unique=False)
+    op.drop_index("ix_tasks_open_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_project_id_status", table_name="tasks")
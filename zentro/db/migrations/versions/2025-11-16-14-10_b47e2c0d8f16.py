@@ -0,0 +1,25 @@
+"""drop the tasks.project_id index covered by composite indexes.
+
+Revision ID: b47e2c0d8f16
+Revises: 6d1b9e4f2a87
+Create Date: 2025-11-16 14:10:38.915742
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b47e2c0d8f16"
+down_revision = "6d1b9e4f2a87"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.drop_index("ix_tasks_project_id", table_name="tasks")
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.create_index("ix_tasks_project_id", "tasks", ["project_id"], unique=False)
@@ -0,0 +1,43 @@
+"""add trigram indexes for task search.
+
+Revision ID: e8a3f61c2b59
+Revises: b47e2c0d8f16
+Create Date: 2025-11-16 14:35:06.152830
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e8a3f61c2b59"
+down_revision = "b47e2c0d8f16"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_tasks_title_trgm",
+        "tasks",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_tasks_description_trgm",
+        "tasks",
+        ["description"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    # pg_trgm is left installed; other objects may have come to depend on it.
+    op.drop_index("ix_tasks_description_trgm", table_name="tasks")
+    op.drop_index("ix_tasks_title_trgm", table_name="tasks")
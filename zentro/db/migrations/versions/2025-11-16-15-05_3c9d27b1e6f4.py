@@ -0,0 +1,47 @@
+"""let foreign keys clean up after deleted tasks and users.
+
+Revision ID: 3c9d27b1e6f4
+Revises: e8a3f61c2b59
+Create Date: 2025-11-16 15:05:43.918206
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3c9d27b1e6f4"
+down_revision = "e8a3f61c2b59"
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table, ON DELETE action)
+FOREIGN_KEYS = (
+    ("project_users", "project_id", "projects", "CASCADE"),
+    ("project_users", "user_id", "users", "CASCADE"),
+    ("task_assignees", "task_id", "tasks", "CASCADE"),
+    ("task_assignees", "user_id", "users", "CASCADE"),
+    ("task_follow_ups", "task_id", "tasks", "CASCADE"),
+    ("task_follow_ups", "recipient_id", "users", "CASCADE"),
+    ("chats", "user_id", "users", "CASCADE"),
+    ("projects", "creator_id", "users", "SET NULL"),
+    ("tasks", "parent_id", "tasks", "SET NULL"),
+    ("tasks", "reporter_id", "users", "SET NULL"),
+)
+
+
+def _recreate(table: str, column: str, referent: str, ondelete=None) -> None:
+    name = f"{table}_{column}_fkey"
+    op.drop_constraint(name, table, type_="foreignkey")
+    op.create_foreign_key(name, table, referent, [column], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    for table, column, referent, ondelete in FOREIGN_KEYS:
+        _recreate(table, column, referent, ondelete)
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    for table, column, referent, _ in FOREIGN_KEYS:
+        _recreate(table, column, referent)
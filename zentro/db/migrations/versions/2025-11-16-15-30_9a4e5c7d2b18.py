@@ -0,0 +1,91 @@
+"""add per-project task status counters.
+
+Revision ID: 9a4e5c7d2b18
+Revises: 3c9d27b1e6f4
+Create Date: 2025-11-16 15:30:28.740512
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "9a4e5c7d2b18"
+down_revision = "3c9d27b1e6f4"
+branch_labels = None
+depends_on = None
+
+task_status_enum = postgresql.ENUM(
+    "DRAFT",
+    "TODO",
+    "IN_PROGRESS",
+    "IN_REVIEW",
+    "DONE",
+    "BLOCKED",
+    name="taskstatus",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    """Run the migration."""
+    op.create_table(
+        "task_status_counts",
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("status", task_status_enum, nullable=False),
+        sa.Column("n", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("project_id", "status"),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_status_counts_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE task_status_counts SET n = n - 1
+                WHERE project_id = OLD.project_id AND status = OLD.status;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO task_status_counts (project_id, status, n)
+                VALUES (NEW.project_id, NEW.status, 1)
+                ON CONFLICT (project_id, status)
+                DO UPDATE SET n = task_status_counts.n + 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_status_counts_sync
+        AFTER INSERT OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_status_counts_sync()
+        """,
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_status_counts_sync_update
+        AFTER UPDATE OF project_id, status ON tasks
+        FOR EACH ROW
+        WHEN (OLD.project_id <> NEW.project_id OR OLD.status <> NEW.status)
+        EXECUTE FUNCTION task_status_counts_sync()
+        """,
+    )
+    # Backfill the counters from existing rows.
+    op.execute(
+        """
+        INSERT INTO task_status_counts (project_id, status, n)
+        SELECT project_id, status, count(*)
+        FROM tasks
+        GROUP BY project_id, status
+        """,
+    )
+
+
+def downgrade() -> None:
+    """Undo the migration."""
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_sync_update ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS task_status_counts_sync ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS task_status_counts_sync()")
+    op.drop_table("task_status_counts")
@@ -1,18 +1,17 @@
 # zentro/db/session_factory.py  <-- NEW FILE
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from zentro.settings import settings
+from zentro.db.engine import make_engine
 
-# 1. Create the engine once. This is the core connection pool.
-engine = create_async_engine(str(settings.db_url), pool_pre_ping=True)
+# 1. Create the engine once. This is the core connection pool, shared by the
+#    web app (see zentro.web.lifespan) and the agent tools.
+engine = make_engine()
 
 # 2. Create a configured "Session" class.
 #    This is the factory that will create individual session objects.
-AsyncSessionFactory = sessionmaker(
+AsyncSessionFactory = async_sessionmaker(
     engine,
-    class_=AsyncSession,
     expire_on_commit=False,
 )
 
@@ -0,0 +1,40 @@
+from enum import IntEnum
+from typing import Optional, Type
+
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import SmallInteger, TypeDecorator
+
+
+class IntEnumType(TypeDecorator):
+    """Stores an ``IntEnum`` as its integer value in a SMALLINT column.
+
+    Unlike ``Enum``, which stores member names, the stored values keep the
+    enum's ordering, so ``role >= :min_role`` works in SQL and can use indexes.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: Type[IntEnum]) -> None:
+        super().__init__()
+        self.enum_class = enum_class
+
+    def process_bind_param(
+        self,
+        value: Optional[int],
+        dialect: Dialect,
+    ) -> Optional[int]:
+        """Convert an enum member (or its int value) to the stored integer."""
+        if value is None:
+            return None
+        return int(self.enum_class(value))
+
+    def process_result_value(
+        self,
+        value: Optional[int],
+        dialect: Dialect,
+    ) -> Optional[IntEnum]:
+        """Convert a stored integer back to its enum member."""
+        if value is None:
+            return None
+        return self.enum_class(value)
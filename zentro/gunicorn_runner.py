@@ -4,6 +4,8 @@ from gunicorn.app.base import BaseApplication
 from gunicorn.util import import_app
 from uvicorn.workers import UvicornWorker as BaseUvicornWorker
 
+from zentro.settings import settings
+
 try:
     import uvloop  # (Found nested import)
 except ImportError:
@@ -25,6 +27,7 @@ class UvicornWorker(BaseUvicornWorker):
         "lifespan": "on",
         "factory": True,
         "proxy_headers": False,
+        "limit_concurrency": settings.limit_concurrency,
     }
 
 
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from functools import wraps
-from typing import List, Optional, cast, Any
+from typing import List, Optional
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 import json
 from loguru import logger
@@ -34,35 +33,13 @@ from zentro.intelligence_manager.schemas import (
 )
 
 from zentro.project_manager.models import User
-from zentro.utils import Conflict, NotFound, ServiceError, F
-from fastapi import HTTPException, status
+from zentro.services.redis.cache import invalidate_response_cache
 from pydantic import BaseModel
 
 # project-agent runner
 from zentro.intelligence_manager.project_agent.agent import get_chat_history, run_agent, stream_agent
 
 
-
-def translate_service_errors(fn: F) -> F:
-    """
-    Decorator which translates service exceptions into HTTPExceptions while
-    preserving the wrapped function's signature so FastAPI/OpenAPI behave correctly.
-    """
-
-    @wraps(fn)
-    async def wrapper(*args: Any, **kwargs: Any) -> Any:
-        try:
-            # original fn might be async (endpoints are async), so await result
-            return await fn(*args, **kwargs)
-        except NotFound as e:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-        except Conflict as e:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
-        except ServiceError as e:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-
-    return cast(F, wrapper)
-
 router = APIRouter()
 
 
@@ -71,14 +48,6 @@ class AgentPromptIn(BaseModel):
     thread_id: Optional[str] = None
 
 
-import uuid
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
-
 @router.post(
     "/run",
     response_model=RunAgentResponse,
@@ -87,9 +56,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
         400: {"description": "Bad request"},
     },
 )
-@translate_service_errors
 async def run_project_agent(
     payload: AgentPromptIn,
+    request: Request,
     # Use the new dependency to get the full User object with an 'id'
     current_user: User = Depends(get_current_user_db),
     session: AsyncSession = Depends(get_db_session),
@@ -140,8 +109,13 @@ async def run_project_agent(
                 detail="Chat not found or you do not have permission to access it.",
             )
 
-    # Run the agent with the determined thread_id
-    agent_result = await run_agent(payload.prompt, thread_id=thread_id_to_use)
+    # Run the agent with the determined thread_id. Its tools commit their
+    # writes on their own sessions, so cached project responses are dropped
+    # once it is done.
+    try:
+        agent_result = await run_agent(payload.prompt, thread_id=thread_id_to_use)
+    finally:
+        await invalidate_response_cache(request.app.state.redis_pool)
 
     # Save user message
     user_message = ChatMessage(
@@ -178,9 +152,9 @@ async def run_project_agent(
         404: {"description": "Chat not found or permission denied"},
     },
 )
-@translate_service_errors
 async def run_project_agent_stream(
     payload: AgentPromptIn,
+    request: Request,
     current_user: User = Depends(get_current_user_db),
     session: AsyncSession = Depends(get_db_session),
 ):
@@ -241,6 +215,9 @@ async def run_project_agent_stream(
         except Exception as e:
             yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
             return
+        finally:
+            # Tools commit on their own sessions; drop cached project responses.
+            await invalidate_response_cache(request.app.state.redis_pool)
 
         # Save messages to DB
         try:
@@ -274,7 +251,6 @@ async def run_project_agent_stream(
         200: {"description": "List of user chats"},
     },
 )
-@translate_service_errors
 async def get_user_chats(
     # Use the new dependency here as well
     current_user: User = Depends(get_current_user_db),
@@ -304,7 +280,6 @@ async def get_user_chats(
         404: {"description": "Chat not found or permission denied"},
     },
 )
-@translate_service_errors
 async def get_chat_history_endpoint(
     thread_id: str,
     current_user: User = Depends(get_current_user_db),
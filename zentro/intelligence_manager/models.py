@@ -1,14 +1,23 @@
 # zentro/intelligence_manager/models.py
 from __future__ import annotations
 
-from datetime import datetime
 import enum
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text, String
+from sqlalchemy import (
+    DDL,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    event,
+    text,
+)
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.sql import func
 
 from zentro.db.base import Base
 
@@ -28,17 +37,30 @@ class TaskFollowUp(Base):
     """Represents a single, AI-generated follow-up for a specific task."""
 
     __tablename__ = "task_follow_ups"
+    __table_args__ = (
+        # Serves the status filter + created_at DESC ordering of list queries.
+        Index(
+            "task_follow_ups_status_created_at_idx",
+            "status",
+            text("created_at DESC"),
+        ),
+        Index(
+            "task_follow_ups_pending_created_at_idx",
+            text("created_at DESC"),
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_id: Mapped[int] = mapped_column(
         Integer,
-        ForeignKey("tasks.id"),
+        ForeignKey("tasks.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
     recipient_id: Mapped[int] = mapped_column(
         Integer,
-        ForeignKey("users.id"),
+        ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
     )
@@ -50,13 +72,57 @@ class TaskFollowUp(Base):
         default=FollowUpStatus.PENDING,
     )
 
-    created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
-
     # Relationships
     task: Mapped["Task"] = relationship("Task")
     recipient: Mapped["User"] = relationship("User")
 
 
+# Per-recipient follow-up counts, kept in sync by the trigger below so stats
+# reads are a point lookup instead of a count over task_follow_ups.
+task_follow_up_stats = Table(
+    "task_follow_up_stats",
+    Base.metadata,
+    Column("recipient_id", Integer, primary_key=True),
+    Column("status", SQLEnum(FollowUpStatus), primary_key=True),
+    Column("n", Integer, nullable=False, server_default=text("0")),
+)
+
+TASK_FOLLOW_UP_STATS_FUNCTION = """
+CREATE OR REPLACE FUNCTION task_follow_up_stats_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE task_follow_up_stats SET n = n - 1
+        WHERE recipient_id = OLD.recipient_id AND status = OLD.status;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO task_follow_up_stats (recipient_id, status, n)
+        VALUES (NEW.recipient_id, NEW.status, 1)
+        ON CONFLICT (recipient_id, status)
+        DO UPDATE SET n = task_follow_up_stats.n + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TASK_FOLLOW_UP_STATS_TRIGGER = """
+CREATE TRIGGER task_follow_up_stats_sync
+AFTER INSERT OR DELETE OR UPDATE OF recipient_id, status ON task_follow_ups
+FOR EACH ROW EXECUTE FUNCTION task_follow_up_stats_sync()
+"""
+
+event.listen(
+    TaskFollowUp.__table__,
+    "after_create",
+    DDL(TASK_FOLLOW_UP_STATS_FUNCTION).execute_if(dialect="postgresql"),
+)
+event.listen(
+    TaskFollowUp.__table__,
+    "after_create",
+    DDL(TASK_FOLLOW_UP_STATS_TRIGGER).execute_if(dialect="postgresql"),
+)
+
+
 class MessageRole(str, enum.Enum):
     """Role of the message sender."""
 
@@ -70,7 +136,7 @@ class Chat(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), index=True
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True
     )  # Assuming you have a users table
     thread_id: Mapped[str] = mapped_column(String(100), unique=True, index=True)
 
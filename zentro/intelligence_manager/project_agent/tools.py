@@ -15,7 +15,7 @@ async def project_get(project_id: int, session: Annotated[str | None, InjectedTo
     """Get a project summary by id ."""
     from zentro.project_manager.services import get_project
 
-    project = await get_project(session, project_id, load_children=False)
+    project = await get_project(session, project_id)
     return f"Project {project.id}: {project.name} | key: {project.key or '-'}"
 
 
@@ -26,10 +26,14 @@ async def project_list(
     user_id: Annotated[int | None, InjectedToolArg] = None,
 ) -> str:
     """List projects visible to the current user ."""
-    from zentro.project_manager.services import list_projects
+    from zentro.project_manager.permissions import member_scope
+    from zentro.project_manager.services import get_user, list_projects
 
     # user_id is now auto-injected from context by the wrapper
-    projects = await list_projects(session, user_id=user_id, limit=limit)
+    member_id = None
+    if user_id:
+        member_id = member_scope(await get_user(session, user_id))
+    projects = await list_projects(session, member_id=member_id, limit=limit)
     if not projects:
         return "No projects."
     return "\n".join(f"- [{p.id}] {p.name}" for p in projects)
@@ -86,7 +90,7 @@ async def task_get(task_id: int, session: Annotated[str | None, InjectedToolArg]
     """Get a task summary by id ."""
     from zentro.project_manager.services import get_task
 
-    task = await get_task(session, task_id, load_relations=False)
+    task = await get_task(session, task_id)
     return f"Task {task.id}: {task.title} | {task.status.value} | {task.priority.value}"
 
 
@@ -365,7 +369,7 @@ async def task_stats_by_status(
     
     total = sum(stats.values())
     lines = [f"Total tasks: {total}"]
-    lines.extend(f"- {status.value}: {count}" for status, count in stats.items())
+    lines.extend(f"- {status}: {count}" for status, count in stats.items())
     
     return "\n".join(lines)
 
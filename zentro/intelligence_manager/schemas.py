@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
@@ -150,7 +150,9 @@ class FollowUpReport(BaseModel):
         description="Average time to acknowledgment in hours",
     )
     most_active_recipient: Optional[UserOut] = None
-    report_generated_at: datetime = Field(default_factory=datetime.utcnow)
+    report_generated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
 
 
 # -----------------------
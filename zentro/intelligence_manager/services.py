@@ -1,15 +1,26 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
-from sqlalchemy import func, select, update
+from sqlalchemy import func, lambda_stmt, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from zentro.intelligence_manager.models import FollowUpStatus, TaskFollowUp
+from zentro.intelligence_manager.models import (
+    FollowUpStatus,
+    TaskFollowUp,
+    task_follow_up_stats,
+)
 from zentro.project_manager.models import Task, User
-from zentro.utils import NotFound, _get_or_404
+from zentro.utils import NotFound, _ensure_exist, _get_or_404
+
+
+# Columns a patch may touch; computed once instead of probing attributes per call.
+_UPDATABLE = frozenset(c.name for c in TaskFollowUp.__table__.columns) - {
+    "id",
+    "created_at",
+}
 
 
 # ---- Task Follow-ups ----
@@ -23,9 +34,8 @@ async def create_task_follow_up(
     status: FollowUpStatus = FollowUpStatus.PENDING,
 ) -> TaskFollowUp:
     """Create a new AI-generated follow-up for a task."""
-    # Validate that task and recipient exist
-    await _get_or_404(session, Task, task_id)
-    await _get_or_404(session, User, recipient_id)
+    # Validate that task and recipient exist, in one query
+    await _ensure_exist(session, {Task: [task_id], User: [recipient_id]})
 
     follow_up = TaskFollowUp(
         task_id=task_id,
@@ -36,7 +46,6 @@ async def create_task_follow_up(
     )
     session.add(follow_up)
     await session.flush()
-    await session.refresh(follow_up)
     return follow_up
 
 
@@ -49,13 +58,13 @@ async def get_task_follow_up(
 ) -> TaskFollowUp:
     """Get a specific task follow-up by ID."""
     if load_relations:
-        q = (
-            select(TaskFollowUp)
+        q = lambda_stmt(
+            lambda: select(TaskFollowUp)
             .options(
                 selectinload(TaskFollowUp.task),
                 selectinload(TaskFollowUp.recipient),
             )
-            .where(TaskFollowUp.id == follow_up_id)
+            .where(TaskFollowUp.id == follow_up_id),
         )
         result = await session.execute(q)
         follow_up = result.scalars().first()
@@ -73,27 +82,44 @@ async def list_task_follow_ups(
     status: Optional[FollowUpStatus] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[tuple[datetime, int]] = None,
     load_relations: bool = True,
 ) -> List[TaskFollowUp]:
-    """List task follow-ups with optional filtering."""
-    q = select(TaskFollowUp)
+    """List task follow-ups with optional filtering.
+
+    Pass ``cursor=(created_at, id)`` of the last row seen to fetch the next
+    page by keyset instead of ``offset``.
+    """
+    # lambda_stmt caches the compiled SQL per combination of filters.
+    q = lambda_stmt(lambda: select(TaskFollowUp))
 
     if load_relations:
-        q = q.options(
+        q += lambda s: s.options(
             selectinload(TaskFollowUp.task),
             selectinload(TaskFollowUp.recipient),
         )
 
     if task_id is not None:
-        q = q.where(TaskFollowUp.task_id == task_id)
+        q += lambda s: s.where(TaskFollowUp.task_id == task_id)
     if recipient_id is not None:
-        q = q.where(TaskFollowUp.recipient_id == recipient_id)
+        q += lambda s: s.where(TaskFollowUp.recipient_id == recipient_id)
     if status is not None:
-        q = q.where(TaskFollowUp.status == status)
+        q += lambda s: s.where(TaskFollowUp.status == status)
+    if cursor is not None:
+        cursor_created_at, cursor_id = cursor
+        q += lambda s: s.where(
+            tuple_(TaskFollowUp.created_at, TaskFollowUp.id)
+            < tuple_(cursor_created_at, cursor_id),
+        )
+    elif offset:
+        q += lambda s: s.offset(offset)
 
-    q = q.order_by(TaskFollowUp.created_at.desc()).offset(offset).limit(limit)
-    result = await session.execute(q)
-    return result.scalars().all()
+    q += lambda s: s.order_by(
+        TaskFollowUp.created_at.desc(),
+        TaskFollowUp.id.desc(),
+    ).limit(limit)
+    result = await session.stream_scalars(q, execution_options={"yield_per": 200})
+    return [follow_up async for follow_up in result]
 
 
 async def update_task_follow_up(
@@ -101,14 +127,25 @@ async def update_task_follow_up(
     follow_up_id: int,
     **patch,
 ) -> TaskFollowUp:
-    """Update a task follow-up with the provided fields."""
-    follow_up = await _get_or_404(session, TaskFollowUp, follow_up_id)
-    for k, v in patch.items():
-        if hasattr(follow_up, k):
-            setattr(follow_up, k, v)
-    session.add(follow_up)
-    await session.flush()
-    await session.refresh(follow_up)
+    """Update a task follow-up with the provided fields.
+
+    Issues a single ``UPDATE ... RETURNING`` instead of load + flush + refresh.
+    """
+    values = {k: v for k, v in patch.items() if k in _UPDATABLE}
+    if not values:
+        return await _get_or_404(session, TaskFollowUp, follow_up_id)
+
+    q = (
+        update(TaskFollowUp)
+        .where(TaskFollowUp.id == follow_up_id)
+        .values(**values)
+        .returning(TaskFollowUp)
+        .execution_options(populate_existing=True)
+    )
+    result = await session.execute(q)
+    follow_up = result.scalars().first()
+    if follow_up is None:
+        raise NotFound(f"TaskFollowUp with id={follow_up_id} not found")
     return follow_up
 
 
@@ -216,14 +253,16 @@ async def count_follow_ups_by_status(
     task_id: Optional[int] = None,
 ) -> List[tuple[FollowUpStatus, int]]:
     """Count follow-ups by status, optionally filtered by recipient or task."""
-    q = select(TaskFollowUp.status, func.count(TaskFollowUp.id)).group_by(
-        TaskFollowUp.status,
+    q = lambda_stmt(
+        lambda: select(TaskFollowUp.status, func.count(TaskFollowUp.id)).group_by(
+            TaskFollowUp.status,
+        ),
     )
 
     if recipient_id is not None:
-        q = q.where(TaskFollowUp.recipient_id == recipient_id)
+        q += lambda s: s.where(TaskFollowUp.recipient_id == recipient_id)
     if task_id is not None:
-        q = q.where(TaskFollowUp.task_id == task_id)
+        q += lambda s: s.where(TaskFollowUp.task_id == task_id)
 
     result = await session.execute(q)
     return [(row[0], row[1]) for row in result.all()]
@@ -233,12 +272,23 @@ async def get_follow_up_stats(
     session: AsyncSession,
     recipient_id: Optional[int] = None,
 ) -> dict:
-    """Get comprehensive follow-up statistics."""
-    counts = await count_follow_ups_by_status(session, recipient_id=recipient_id)
+    """Get comprehensive follow-up statistics.
+
+    Reads the trigger-maintained ``task_follow_up_stats`` counters instead of
+    counting ``task_follow_ups``.
+    """
+    q = select(
+        task_follow_up_stats.c.status,
+        func.sum(task_follow_up_stats.c.n),
+    ).group_by(task_follow_up_stats.c.status)
+    if recipient_id is not None:
+        q = q.where(task_follow_up_stats.c.recipient_id == recipient_id)
+
+    result = await session.execute(q)
     stats = {status.value: 0 for status in FollowUpStatus}
 
-    for status, count in counts:
-        stats[status.value] = count
+    for status, count in result.all():
+        stats[status.value] = int(count)
 
     stats["total"] = sum(stats.values())
     return stats
@@ -250,21 +300,21 @@ async def create_bulk_follow_ups(
     follow_ups_data: List[dict],
 ) -> List[TaskFollowUp]:
     """Create multiple follow-ups in a single transaction."""
-    follow_ups = []
-    for data in follow_ups_data:
-        # Validate required foreign keys
-        await _get_or_404(session, Task, data["task_id"])
-        await _get_or_404(session, User, data["recipient_id"])
+    # Validate all foreign keys with a single query
+    await _ensure_exist(
+        session,
+        {
+            Task: [data["task_id"] for data in follow_ups_data],
+            User: [data["recipient_id"] for data in follow_ups_data],
+        },
+    )
 
-        follow_up = TaskFollowUp(**data)
-        session.add(follow_up)
-        follow_ups.append(follow_up)
+    follow_ups = [TaskFollowUp(**data) for data in follow_ups_data]
+    session.add_all(follow_ups)
 
+    # A single flush inserts every row; ids and server defaults come back via
+    # RETURNING (eager_defaults), so no per-row refresh is needed.
     await session.flush()
-    # Refresh all objects to get their IDs
-    for follow_up in follow_ups:
-        await session.refresh(follow_up)
-
     return follow_ups
 
 
@@ -273,7 +323,7 @@ async def cleanup_old_acknowledged_follow_ups(
     days_old: int = 30,
 ) -> int:
     """Remove acknowledged follow-ups older than specified days. Returns count of deleted records."""
-    cutoff_date = datetime.now(timezone.utc) - timezone.timedelta(days=days_old)
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
 
     # First get the IDs to delete
     q_select = select(TaskFollowUp.id).where(
@@ -327,7 +377,6 @@ async def generate_follow_up_for_overdue_task(
     )
     session.add(follow_up)
     await session.flush()
-    await session.refresh(follow_up)
     return follow_up
 
 
@@ -342,8 +391,8 @@ async def search_follow_ups(
 ) -> List[TaskFollowUp]:
     """Search follow-ups by message content or reason."""
     like_term = f"%{search_term}%"
-    q = (
-        select(TaskFollowUp)
+    q = lambda_stmt(
+        lambda: select(TaskFollowUp)
         .options(
             selectinload(TaskFollowUp.task),
             selectinload(TaskFollowUp.recipient),
@@ -351,15 +400,15 @@ async def search_follow_ups(
         .where(
             (TaskFollowUp.generated_message.ilike(like_term))
             | (TaskFollowUp.reason.ilike(like_term)),
-        )
+        ),
     )
 
     if recipient_id is not None:
-        q = q.where(TaskFollowUp.recipient_id == recipient_id)
+        q += lambda s: s.where(TaskFollowUp.recipient_id == recipient_id)
     if status is not None:
-        q = q.where(TaskFollowUp.status == status)
+        q += lambda s: s.where(TaskFollowUp.status == status)
 
-    q = q.order_by(TaskFollowUp.created_at.desc()).limit(limit)
+    q += lambda s: s.order_by(TaskFollowUp.created_at.desc()).limit(limit)
     result = await session.execute(q)
     return result.scalars().all()
 
@@ -1,18 +1,22 @@
-# zentro/agents/tools/_db.py
 from __future__ import annotations
 
 import contextvars
 import inspect
+import typing
 from functools import wraps
-from typing import Any, Optional
-from typing import Awaitable, Callable, ParamSpec, TypeVar, Annotated
+from typing import Any, Awaitable, Callable, Optional, ParamSpec, TypeVar
+
 from langchain.tools import tool
 from langchain_core.tools import InjectedToolArg
+
 from zentro.db.session_factory import get_db_session_factory
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
+# Parameters that may be filled in from the agent context instead of the LLM.
+_INJECTABLE_PARAMS = ("user_id", "creator_id")
+
 # Context variable to store the current user_id for agent tools
 _current_user_id: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
     "_current_user_id", default=None
@@ -29,52 +33,66 @@ def set_current_user_id(user_id: Optional[int]) -> None:
     _current_user_id.set(user_id)
 
 
+def _injected_params(func: Callable[..., Any]) -> tuple[str, ...]:
+    """Return the injectable parameters annotated with ``InjectedToolArg``.
+
+    Resolved once per decorated function; tools modules use postponed
+    annotations, so the hints are evaluated instead of read raw.
+    """
+    try:
+        hints = typing.get_type_hints(func, include_extras=True)
+    except Exception:
+        hints = {
+            name: param.annotation
+            for name, param in inspect.signature(func).parameters.items()
+        }
+    return tuple(
+        name
+        for name in _INJECTABLE_PARAMS
+        if any(
+            # Tools annotate with the class itself, not an instance.
+            isinstance(metadata, InjectedToolArg)
+            or (isinstance(metadata, type) and issubclass(metadata, InjectedToolArg))
+            for metadata in getattr(hints.get(name), "__metadata__", ())
+        )
+    )
+
+
 def with_db_session(
     func: Callable[P, Awaitable[R]],
 ) -> Callable[P, Awaitable[R]]:
     """Inject an AsyncSession and run inside a transaction.
-    
+
     Also auto-injects user_id from context if the function parameter
-    is annotated with InjectedToolArg.
+    is annotated with InjectedToolArg. Arguments passed explicitly are
+    left alone; an explicit session is used as is, and the caller owns
+    its transaction.
     """
+    injected = _injected_params(func)
+
     @wraps(func)
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        if injected:
+            user_id = get_current_user_id()
+            if user_id is not None:
+                for param_name in injected:
+                    kwargs.setdefault(param_name, user_id)
+
+        if kwargs.get("session") is not None:
+            return await func(*args, **kwargs)
+
         # Get session factory directly (works outside FastAPI context)
         session_factory = get_db_session_factory()
         async with session_factory() as session:
             try:
-                # Auto-inject session
                 kwargs["session"] = session
-                
-                # Auto-inject user_id from context if parameter is marked as injected
-                sig = inspect.signature(func)
-                for param_name, param in sig.parameters.items():
-                    # Check if this is a user_id or creator_id parameter marked with InjectedToolArg
-                    if param_name in ("user_id", "creator_id") and param_name not in kwargs:
-                        # Check if parameter has InjectedToolArg annotation
-                        # The annotation could be Annotated[type, InjectedToolArg()] or similar
-                        import typing
-                        if hasattr(typing, 'get_args'):
-                            # Python 3.8+
-                            annotation = param.annotation
-                            # Check if it's an Annotated type
-                            if hasattr(annotation, '__metadata__'):
-                                # It's an Annotated type, check metadata
-                                for metadata in getattr(annotation, '__metadata__', []):
-                                    # Check if InjectedToolArg is in the metadata
-                                    if type(metadata).__name__ == 'InjectedToolArg':
-                                        # Inject user_id from context
-                                        user_id = get_current_user_id()
-                                        if user_id is not None:
-                                            kwargs[param_name] = user_id
-                                        break
-                
                 result = await func(*args, **kwargs)
                 await session.commit()
                 return result
             except Exception:
                 await session.rollback()
                 raise
+
     return wrapper
 
 
@@ -1,53 +1,86 @@
-from functools import wraps
-from typing import List, Optional, cast, Any
+import asyncio
+import hashlib
+from typing import Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from zentro.db.dependencies import get_db_session
 from zentro.project_manager import services
 from zentro.project_manager.enums import Priority, TaskStatus, ProjectRole, UserRole
-from zentro.project_manager.models import User
 from zentro.project_manager.schemas import (
+    BulkAssignIn,
+    BulkTaskCreateIn,
     EpicCreate,
     EpicOut,
     PrioritySuggestionOut,
     ProjectCreate,
     ProjectOut,
+    ProjectOverviewOut,
     SprintCreate,
     SprintOut,
     TaskCreate,
     TaskOut,
+    TaskUpdate,
 )
 from zentro.project_manager.permissions import (
+    member_scope,
     require_admin,
     verify_project_access,
     verify_task_access,
 )
-from zentro.auth.dependencies import get_current_user_db
-from zentro.utils import Conflict, NotFound, ServiceError, F
+from zentro.auth.dependencies import (
+    CurrentUser,
+    get_current_user_claims,
+    invalidate_cached_user,
+)
+
+router = APIRouter()
+
 
+# List responses are validated and dumped to JSON in one pass by pydantic-core,
+# instead of FastAPI re-validating every item against response_model.
+_PROJECTS = TypeAdapter(List[ProjectOut])
+_EPICS = TypeAdapter(List[EpicOut])
+_SPRINTS = TypeAdapter(List[SprintOut])
+_TASKS = TypeAdapter(List[TaskOut])
 
-def translate_service_errors(fn: F) -> F:
+
+def _list_etag(items: list) -> str:
+    """Weak ETag over the ids and ``updated_at`` of a page of rows.
+
+    Any change to what the page would render moves an ``updated_at`` or the
+    id list, so the tag can be checked before anything is serialized.
     """
-    Decorator which translates service exceptions into HTTPExceptions while
-    preserving the wrapped function's signature so FastAPI/OpenAPI behave correctly.
+    digest = hashlib.blake2b(digest_size=8)
+    for item in items:
+        digest.update(f"{item.id}:{item.updated_at.isoformat()};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _list_response(
+    request: Request,
+    adapter: TypeAdapter,
+    items: list,
+    limit: Optional[int] = None,
+) -> Response:
     """
+    Serialize a page of ORM rows, exposing the last id as ``X-Next-Cursor``
+    when the page came back full.
 
-    @wraps(fn)
-    async def wrapper(*args: Any, **kwargs: Any) -> Any:
-        try:
-            # original fn might be async (endpoints are async), so await result
-            return await fn(*args, **kwargs)
-        except NotFound as e:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-        except Conflict as e:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
-        except ServiceError as e:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    return cast(F, wrapper)
-
-router = APIRouter()
+    Pages carry a weak ETag; a matching ``If-None-Match`` gets an empty 304
+    and skips serialization altogether.
+    """
+    headers = {"ETag": _list_etag(items), "Cache-Control": "private, no-cache"}
+    if limit is not None and items and len(items) == limit:
+        headers["X-Next-Cursor"] = str(items[-1].id)
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["ETag"] in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+    return Response(body, media_type="application/json", headers=headers)
 
 
 # -----------------------
@@ -62,10 +95,9 @@ router = APIRouter()
         409: {"description": "Project with this key/name already exists"},
     },
 )
-@translate_service_errors
 async def create_project(
     payload: ProjectCreate,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -89,10 +121,9 @@ async def create_project(
         404: {"description": "Project not found or permission denied"},
     },
 )
-@translate_service_errors
 async def get_project(
     project_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -101,7 +132,31 @@ async def get_project(
     Requires project access (any role).
     """
     await verify_project_access(project_id, current_user, session)
-    return await services.get_project(session, project_id, load_children=False)
+    return await services.get_project(session, project_id)
+
+
+@router.get(
+    "/{project_id}/overview",
+    response_model=ProjectOverviewOut,
+    responses={
+        404: {"description": "Project not found or permission denied"},
+    },
+)
+async def get_project_overview(
+    project_id: int,
+    current_user: CurrentUser = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Get project details together with all of its epics and sprints, instead
+    of fetching the project, its epics and its sprints separately.
+
+    Requires project access (any role).
+    """
+    await verify_project_access(project_id, current_user, session)
+    return await services.get_project(
+        session, project_id, include_epics=True, include_sprints=True,
+    )
 
 
 @router.get(
@@ -111,11 +166,12 @@ async def get_project(
         200: {"description": "List of projects"},
     },
 )
-@translate_service_errors
 async def list_projects(
+    request: Request,
     limit: int = 50,
     offset: int = 0,
-    current_user: User = Depends(get_current_user_db),
+    after_id: Optional[int] = None,
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -123,25 +179,27 @@ async def list_projects(
     
     - **limit**: Maximum number of projects to return.
     - **offset**: Number of projects to skip.
+    - **after_id**: Return projects after this id; use the `X-Next-Cursor` header of the previous page.
     """
-    return await services.list_projects(
+    projects = await services.list_projects(
         session,
-        user_id=current_user.id,
+        member_id=member_scope(current_user),
         limit=limit,
-        offset=offset
+        offset=offset,
+        after_id=after_id,
     )
+    return _list_response(request, _PROJECTS, projects, limit)
 
 
 @router.post(
     "/{project_id}/users/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-@translate_service_errors
 async def add_user_to_project(
     project_id: int,
     user_id: int,
     role: ProjectRole = ProjectRole.DEVELOPER,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -156,11 +214,10 @@ async def add_user_to_project(
     "/{project_id}/users/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-@translate_service_errors
 async def remove_user_from_project(
     project_id: int,
     user_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -175,12 +232,11 @@ async def remove_user_from_project(
     "/{project_id}/users/{user_id}/role",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-@translate_service_errors
 async def update_user_project_role(
     project_id: int,
     user_id: int,
     new_role: ProjectRole,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -195,10 +251,9 @@ async def update_user_project_role(
 # Epic endpoints
 # -----------------------
 @router.post("/epics", response_model=EpicOut, status_code=status.HTTP_201_CREATED)
-@translate_service_errors
 async def create_epic(
     payload: EpicCreate,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """Create epic. Requires PROJECT_MANAGER or higher role."""
@@ -215,39 +270,44 @@ async def create_epic(
 
 
 @router.get("/{project_id}/epics", response_model=List[EpicOut])
-@translate_service_errors
 async def list_epics(
     project_id: int,
-    current_user: User = Depends(get_current_user_db),
+    request: Request,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """List project epics. Requires project access."""
-    await verify_project_access(project_id, current_user, session)
-    return await services.list_epics(session, project_id)
+    epics = await services.list_epics(
+        session, project_id, after_id=after_id, limit=limit,
+        member_id=member_scope(current_user),
+    )
+    if not epics:
+        await verify_project_access(project_id, current_user, session)
+    return _list_response(request, _EPICS, epics, limit)
 
 
 @router.delete("/epics/{epic_id}", status_code=status.HTTP_204_NO_CONTENT)
-@translate_service_errors
 async def delete_epic(
     epic_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """Delete epic. Requires PROJECT_MANAGER or higher role."""
-    # Get epic's project_id first
-    epic = await services.get_epic(session, epic_id)
-    await verify_project_access(epic.project_id, current_user, session, ProjectRole.PROJECT_MANAGER)
-    await services.delete_epic(session, epic_id)
+    await services.delete_epic(
+        session, epic_id,
+        member_id=member_scope(current_user), min_role=ProjectRole.PROJECT_MANAGER,
+    )
 
 
 # -----------------------
 # Sprint endpoints
 # -----------------------
 @router.post("/sprints", response_model=SprintOut, status_code=status.HTTP_201_CREATED)
-@translate_service_errors
 async def create_sprint(
     payload: SprintCreate,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """Create sprint. Requires PROJECT_MANAGER or higher role."""
@@ -264,31 +324,39 @@ async def create_sprint(
 
 
 @router.get("/{project_id}/sprints", response_model=List[SprintOut])
-@translate_service_errors
 async def list_sprints(
     project_id: int,
-    current_user: User = Depends(get_current_user_db),
+    request: Request,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """List project sprints. Requires project access."""
-    await verify_project_access(project_id, current_user, session)
-    return await services.list_sprints(session, project_id)
+    sprints = await services.list_sprints(
+        session, project_id, after_id=after_id, limit=limit,
+        member_id=member_scope(current_user),
+    )
+    if not sprints:
+        await verify_project_access(project_id, current_user, session)
+    return _list_response(request, _SPRINTS, sprints, limit)
 
 
 @router.post(
     "/{project_id}/sprints/{sprint_id}/activate",
     response_model=SprintOut,
 )
-@translate_service_errors
 async def activate_sprint(
     project_id: int,
     sprint_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """Activate sprint. Requires PROJECT_MANAGER or higher role."""
-    await verify_project_access(project_id, current_user, session, ProjectRole.PROJECT_MANAGER)
-    return await services.set_active_sprint(session, project_id, sprint_id)
+    return await services.set_active_sprint(
+        session, project_id, sprint_id,
+        member_id=member_scope(current_user), min_role=ProjectRole.PROJECT_MANAGER,
+    )
 
 
 # -----------------------
@@ -303,10 +371,9 @@ async def activate_sprint(
         403: {"description": "Permission denied (Requires REPORTER role)"},
     },
 )
-@translate_service_errors
 async def create_task(
     payload: TaskCreate,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -348,6 +415,37 @@ async def create_task(
     )
 
 
+@router.post(
+    "/{project_id}/tasks/bulk",
+    response_model=List[TaskOut],
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        404: {"description": "Project, Epic, Sprint, or Parent Task not found"},
+        403: {"description": "Permission denied (Requires REPORTER role)"},
+    },
+)
+async def create_tasks_bulk(
+    project_id: int,
+    payload: BulkTaskCreateIn,
+    current_user: CurrentUser = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Create several tasks in a project at once, e.g. for an import.
+
+    Requires REPORTER or higher role in the project. Tasks are returned in the
+    order they were sent.
+    """
+    await verify_project_access(project_id, current_user, session, ProjectRole.REPORTER)
+    return await services.create_tasks_bulk(
+        session,
+        [
+            {**task.model_dump(), "project_id": project_id, "reporter_id": current_user.id}
+            for task in payload.tasks
+        ],
+    )
+
+
 @router.get(
     "/tasks/{task_id}",
     response_model=TaskOut,
@@ -355,10 +453,9 @@ async def create_task(
         404: {"description": "Task not found or permission denied"},
     },
 )
-@translate_service_errors
 async def get_task(
     task_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -366,8 +463,8 @@ async def get_task(
     
     Requires project access.
     """
-    await verify_task_access(task_id, current_user, session)
-    return await services.get_task(session, task_id, load_relations=False)
+    task = await verify_task_access(task_id, current_user, session)
+    return await services.get_task(session, task_id, task=task)
 
 
 @router.get(
@@ -377,14 +474,17 @@ async def get_task(
         404: {"description": "Project not found or permission denied"},
     },
 )
-@translate_service_errors
 async def list_tasks(
     project_id: int,
     status: Optional[TaskStatus] = None,
     priority: Optional[Priority] = None,
     limit: int = 100,
     offset: int = 0,
-    current_user: User = Depends(get_current_user_db),
+    after_id: Optional[int] = None,
+    include: Optional[Literal["count"]] = None,
+    *,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -394,16 +494,29 @@ async def list_tasks(
     - **priority**: Filter by task priority. Allowed values: `low`, `medium`, `high`, `critical`, `blocker`.
     - **limit**: Maximum number of tasks to return.
     - **offset**: Number of tasks to skip.
+    - **after_id**: Return tasks after this id; use the `X-Next-Cursor` header of the previous page.
+    - **include**: Pass `count` to also get the total number of matching tasks in the `X-Total-Count` header.
     """
-    await verify_project_access(project_id, current_user, session)
-    return await services.list_tasks(
-        session,
-        project_id=project_id,
-        status=status,
-        priority=priority,
-        limit=limit,
-        offset=offset,
-    )
+    filters = {"project_id": project_id, "status": status, "priority": priority}
+    page = {"limit": limit, "offset": offset, "after_id": after_id}
+    member_id = member_scope(current_user)
+    if include != "count":
+        tasks = await services.list_tasks(session, **filters, **page, member_id=member_id)
+        if not tasks:
+            await verify_project_access(project_id, current_user, session)
+        return _list_response(request, _TASKS, tasks, limit)
+
+    # The count runs concurrently on a sibling session from the pool.
+    async with request.app.state.db_session_factory() as count_session:
+        tasks, total = await asyncio.gather(
+            services.list_tasks(session, **filters, **page, member_id=member_id),
+            services.count_tasks(count_session, **filters),
+        )
+    if not tasks:
+        await verify_project_access(project_id, current_user, session)
+    response = _list_response(request, _TASKS, tasks, limit)
+    response.headers["X-Total-Count"] = str(total)
+    return response
 
 
 @router.patch(
@@ -414,11 +527,10 @@ async def list_tasks(
         403: {"description": "Permission denied (Requires DEVELOPER role)"},
     },
 )
-@translate_service_errors
 async def patch_task(
     task_id: int,
-    payload: TaskCreate,
-    current_user: User = Depends(get_current_user_db),
+    payload: TaskUpdate,
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -441,9 +553,11 @@ async def patch_task(
     - `critical`
     - `blocker`
     """
-    await verify_task_access(task_id, current_user, session, ProjectRole.DEVELOPER)
-    data = payload.model_dump(exclude_unset=True)
-    return await services.update_task(session, task_id, **data)
+    task = await verify_task_access(task_id, current_user, session, ProjectRole.DEVELOPER)
+    data = {field: getattr(payload, field) for field in payload.model_fields_set}
+    if not data:
+        return task
+    return await services.update_task(session, task_id, task=task, **data)
 
 
 @router.delete(
@@ -454,10 +568,9 @@ async def patch_task(
         403: {"description": "Permission denied (Requires PROJECT_MANAGER role)"},
     },
 )
-@translate_service_errors
 async def delete_task(
     task_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """
@@ -473,11 +586,10 @@ async def delete_task(
     "/tasks/{task_id}/assign/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-@translate_service_errors
 async def assign_task(
     task_id: int,
     user_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """Assign task to user. Requires DEVELOPER or higher role."""
@@ -489,58 +601,142 @@ async def assign_task(
     "/tasks/{task_id}/assign/{user_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-@translate_service_errors
 async def unassign_task(
     task_id: int,
     user_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """Unassign task from user. Requires DEVELOPER or higher role."""
-    await verify_task_access(task_id, current_user, session, ProjectRole.DEVELOPER)
-    await services.unassign_task(session, task_id, user_id)
+    await services.unassign_task(
+        session, task_id, user_id,
+        member_id=member_scope(current_user), min_role=ProjectRole.DEVELOPER,
+    )
+
+
+@router.post(
+    "/tasks/assign-bulk",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        404: {"description": "Task or user not found"},
+        403: {"description": "Permission denied (Requires DEVELOPER role on every task)"},
+    },
+)
+async def assign_tasks_bulk(
+    payload: BulkAssignIn,
+    current_user: CurrentUser = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Assign several tasks to users at once; already assigned pairs are skipped.
+    Requires DEVELOPER or higher role in every affected project.
+    """
+    await services.assign_tasks_bulk(
+        session,
+        [(a.task_id, a.user_id) for a in payload.assignments],
+        member_id=member_scope(current_user),
+        min_role=ProjectRole.DEVELOPER,
+    )
+
+
+@router.post(
+    "/tasks/unassign-bulk",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        404: {"description": "Task not found"},
+        403: {"description": "Permission denied (Requires DEVELOPER role on every task)"},
+    },
+)
+async def unassign_tasks_bulk(
+    payload: BulkAssignIn,
+    current_user: CurrentUser = Depends(get_current_user_claims),
+    session: AsyncSession = Depends(get_db_session),
+):
+    """
+    Remove several task assignments at once; pairs that aren't assigned are skipped.
+    Requires DEVELOPER or higher role in every affected project.
+    """
+    await services.unassign_tasks_bulk(
+        session,
+        [(a.task_id, a.user_id) for a in payload.assignments],
+        member_id=member_scope(current_user),
+        min_role=ProjectRole.DEVELOPER,
+    )
 
 
 # -----------------------
 # Reporting / search endpoints
 # -----------------------
-@router.get("/{project_id}/task-counts")
-@translate_service_errors
+@router.get(
+    "/{project_id}/task-counts",
+    response_model=Dict[str, int],
+    response_class=ORJSONResponse,
+)
 async def count_tasks_by_status(
     project_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """Get task counts by status. Requires project access."""
-    await verify_project_access(project_id, current_user, session)
-    data = await services.count_tasks_by_status(session, project_id)
-    return {str(k): v for k, v in data}
+    counts = await services.count_tasks_by_status(
+        session, project_id, member_id=member_scope(current_user),
+    )
+    if not counts:
+        await verify_project_access(project_id, current_user, session)
+    # Keys and values are already plain str/int; skip response-model encoding.
+    return ORJSONResponse(counts)
 
 
 @router.get("/{project_id}/tasks/search", response_model=List[TaskOut])
-@translate_service_errors
 async def search_tasks(
     project_id: int,
     q: str,
+    request: Request,
     limit: int = 50,
-    current_user: User = Depends(get_current_user_db),
+    format: Literal["json", "ndjson"] = "json",
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
-    """Search tasks in project. Requires project access."""
+    """
+    Search tasks in project. Requires project access.
+
+    - **format**: `ndjson` streams one task per line as rows are read,
+      instead of building the whole list first.
+    """
+    if format == "json":
+        tasks = await services.search_tasks(
+            session, project_id, q, limit=limit, member_id=member_scope(current_user),
+        )
+        if not tasks:
+            await verify_project_access(project_id, current_user, session)
+        return _list_response(request, _TASKS, tasks)
+
+    # Access has to be settled before the response starts streaming.
     await verify_project_access(project_id, current_user, session)
-    return await services.search_tasks(session, project_id, q, limit=limit)
+
+    # The request session is closed before the body is streamed, so the
+    # generator reads on its own session.
+    session_factory = request.app.state.db_session_factory
+
+    async def rows():
+        async with session_factory() as stream_session:
+            async for task in services.stream_search_tasks(
+                stream_session, project_id, q, limit=limit,
+            ):
+                yield TaskOut.model_validate(task).model_dump_json() + "\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
 
 
 @router.get("/tasks/{task_id}/suggest-priority", response_model=PrioritySuggestionOut)
-@translate_service_errors
 async def suggest_priority(
     task_id: int,
-    current_user: User = Depends(get_current_user_db),
+    current_user: CurrentUser = Depends(get_current_user_claims),
     session: AsyncSession = Depends(get_db_session),
 ):
     """Suggest priority for task. Requires project access."""
-    await verify_task_access(task_id, current_user, session)
-    p = await services.suggest_priority_for_task(session, task_id)
+    task = await verify_task_access(task_id, current_user, session)
+    p = await services.suggest_priority_for_task(session, task_id, task=task)
     return PrioritySuggestionOut(task_id=task_id, suggested_priority=p)
 
 
@@ -548,7 +744,6 @@ async def suggest_priority(
 # Admin endpoints
 # -----------------------
 @router.patch("/users/{user_id}/role", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
-@translate_service_errors
 async def update_user_global_role(
     user_id: int,
     new_role: UserRole,
@@ -556,3 +751,12 @@ async def update_user_global_role(
 ):
     """Update user's global role. Requires ADMIN privileges."""
     await services.update_user_global_role(session, user_id, new_role)
+    invalidate_cached_user(user_id)
+
+
+@router.post("/task-counts/rebuild", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
+async def rebuild_task_status_counts(
+    session: AsyncSession = Depends(get_db_session),
+):
+    """Recompute the per-project task counters from scratch. Requires ADMIN privileges."""
+    await services.rebuild_task_status_counts(session)
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class TaskStatus(str, Enum):
@@ -18,17 +18,34 @@ class Priority(str, Enum):
     BLOCKER = "blocker"
 
 
-class UserRole(Enum):
+class _RankedRole(IntEnum):
+    """
+    Roles ordered by privilege, so checks are plain comparisons.
+    Still accepts the old string values (e.g. "developer") and names.
+    """
+
+    @classmethod
+    def _missing_(cls, value):
+        if isinstance(value, str):
+            member = cls.__members__.get(value.upper())
+            if member is not None:
+                return member
+            if value.isdigit():
+                return cls(int(value))
+        return None
+
+
+class UserRole(_RankedRole):
     """Global user roles"""
-    SUPER_ADMIN = "super_admin"  # Full system access
-    ADMIN = "admin"  # Can manage most resources
-    USER = "user"  # Regular user with limited access
+    USER = 0  # Regular user with limited access
+    ADMIN = 1  # Can manage most resources
+    SUPER_ADMIN = 2  # Full system access
 
 
-class ProjectRole(Enum):
+class ProjectRole(_RankedRole):
     """Project-specific roles for fine-grained control"""
-    PROJECT_ADMIN = "project_admin"  # Full control over project
-    PROJECT_MANAGER = "project_manager"  # Can manage sprints, epics, assign tasks
-    DEVELOPER = "developer"  # Can create/update tasks, update own assignments
-    REPORTER = "reporter"  # Can create tasks, view project
-    VIEWER = "viewer"  # Read-only access to project
+    VIEWER = 0  # Read-only access to project
+    REPORTER = 1  # Can create tasks, view project
+    DEVELOPER = 2  # Can create/update tasks, update own assignments
+    PROJECT_MANAGER = 3  # Can manage sprints, epics, assign tasks
+    PROJECT_ADMIN = 4  # Full control over project
@@ -4,6 +4,7 @@ from datetime import date, datetime
 from typing import List, Optional
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     Date,
@@ -12,28 +13,56 @@ from sqlalchemy import (
     Integer,
     String,
     Table,
-    Text, DateTime,
+    Text, DateTime, Index, event, text,
 )
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, Relationship, mapped_column, relationship
 
 from zentro.db.base import Base
+from zentro.db.types import IntEnumType
 from zentro.project_manager.enums import Priority, TaskStatus, UserRole, ProjectRole
 
 
 project_users = Table(
     "project_users",
     Base.metadata,
-    Column("project_id", Integer, ForeignKey("projects.id"), primary_key=True),
-    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
-    Column("role", SQLEnum(ProjectRole), default=ProjectRole.DEVELOPER, nullable=False),
+    Column(
+        "project_id",
+        Integer,
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "user_id",
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("role", IntEnumType(ProjectRole), default=ProjectRole.DEVELOPER, nullable=False),
+    # A user's memberships are read by user_id; INCLUDE role keeps it index-only.
+    Index(
+        "ix_project_users_user_project_role",
+        "user_id",
+        "project_id",
+        postgresql_include=["role"],
+    ),
 )
 
 task_assignees = Table(
     "task_assignees",
     Base.metadata,
-    Column("task_id", Integer, ForeignKey("tasks.id"), primary_key=True),
-    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column(
+        "task_id",
+        Integer,
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "user_id",
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
 )
 
 
@@ -57,7 +86,7 @@ class User(Base):
 
     # Global role for system-wide permissions
     role: Mapped[UserRole] = mapped_column(
-        SQLEnum(UserRole), default=UserRole.USER, nullable=False, index=True
+        IntEnumType(UserRole), default=UserRole.USER, nullable=False, index=True
     )
 
     # relationships
@@ -65,15 +94,20 @@ class User(Base):
         "Project",
         secondary=project_users,
         back_populates="users",
+        lazy="raise",
     )
     assigned_tasks: Relationship[List["Task"]] = relationship(
         "Task",
         secondary=task_assignees,
         back_populates="assignees",
+        lazy="raise",
     )
 
     chats: Mapped[List["Chat"]] = relationship(  # type: ignore
-        "Chat", back_populates="user", cascade="all, delete-orphan"
+        "Chat",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
@@ -88,7 +122,7 @@ class Project(Base):
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     creator_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=True,
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True,
     )
 
     # relationships
@@ -96,16 +130,16 @@ class Project(Base):
         "User", foreign_keys=[creator_id],
     )
     users: Relationship[List[User]] = relationship(
-        "User", secondary=project_users, back_populates="projects",
+        "User", secondary=project_users, back_populates="projects", lazy="raise",
     )
     epics: Relationship[List["Epic"]] = relationship(
-        "Epic", back_populates="project", cascade="all,delete-orphan",
+        "Epic", back_populates="project", cascade="all,delete-orphan", lazy="raise",
     )
     sprints: Relationship[List["Sprint"]] = relationship(
-        "Sprint", back_populates="project", cascade="all,delete-orphan",
+        "Sprint", back_populates="project", cascade="all,delete-orphan", lazy="raise",
     )
     tasks: Relationship[List["Task"]] = relationship(
-        "Task", back_populates="project", cascade="all,delete-orphan",
+        "Task", back_populates="project", cascade="all,delete-orphan", lazy="raise",
     )
 
 
@@ -124,7 +158,10 @@ class Epic(Base):
     end_date: Mapped[Optional[date]] = mapped_column(Date)
 
     project: Relationship[Project] = relationship("Project", back_populates="epics")
-    tasks: Relationship[List["Task"]] = relationship("Task", back_populates="epic")
+    # Deleting an epic leaves its tasks in place; the FK nulls their epic_id.
+    tasks: Relationship[List["Task"]] = relationship(
+        "Task", back_populates="epic", passive_deletes=True, lazy="raise",
+    )
 
 
 # --- sprint ---
@@ -142,30 +179,62 @@ class Sprint(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     project: Relationship[Project] = relationship("Project", back_populates="sprints")
-    tasks: Relationship[List["Task"]] = relationship("Task", back_populates="sprint")
+    tasks: Relationship[List["Task"]] = relationship(
+        "Task", back_populates="sprint", lazy="raise",
+    )
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination of a project's tasks: WHERE project_id = ? AND id > ?
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        # Per-project status filters and the status counts of a project.
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        # Overdue scan: due_date < today over tasks that are not done yet.
+        Index(
+            "ix_tasks_open_due_date",
+            "due_date",
+            postgresql_where=text("status != 'DONE'"),
+        ),
+        # search_tasks' ILIKE '%term%' filters; trigram GIN indexes serve
+        # substring matches that a B-tree can't (needs the pg_trgm extension).
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_tasks_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # Indexed by the composite indexes above, which lead with project_id.
     project_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("projects.id"), nullable=False, index=True,
+        Integer, ForeignKey("projects.id"), nullable=False,
     )
     epic_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("epics.id"), nullable=True, index=True,
+        Integer,
+        ForeignKey("epics.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
     )
     sprint_id: Mapped[Optional[int]] = mapped_column(
         Integer, ForeignKey("sprints.id"), nullable=True, index=True,
     )
     parent_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("tasks.id"), nullable=True,
+        Integer, ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True,
     )
 
     title: Mapped[str] = mapped_column(String(300), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     status: Mapped[TaskStatus] = mapped_column(
-        SQLEnum(TaskStatus), default=TaskStatus.TODO, index=True, nullable=False,
+        SQLEnum(TaskStatus), default=TaskStatus.TODO, nullable=False,
     )
     priority: Mapped[Priority] = mapped_column(
         SQLEnum(Priority), default=Priority.MEDIUM, index=True, nullable=False,
@@ -174,7 +243,7 @@ class Task(Base):
     remaining: Mapped[Optional[float]] = mapped_column(Float)  # remaining estimate
     due_date: Mapped[Optional[date]] = mapped_column(Date)
     reporter_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=True,
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True,
     )
     order_index: Mapped[int] = mapped_column(Integer, default=0)
 
@@ -191,5 +260,65 @@ class Task(Base):
         "User", foreign_keys=[reporter_id],
     )
     assignees: Relationship[List[User]] = relationship(
-        "User", secondary=task_assignees, back_populates="assigned_tasks",
+        "User", secondary=task_assignees, back_populates="assigned_tasks", lazy="raise",
     )
+
+
+# Per-project task counts by status, kept in sync by the triggers below so the
+# task-count endpoints are a point lookup instead of a GROUP BY over tasks.
+task_status_counts = Table(
+    "task_status_counts",
+    Base.metadata,
+    Column("project_id", Integer, primary_key=True),
+    Column("status", SQLEnum(TaskStatus), primary_key=True),
+    Column("n", Integer, nullable=False, server_default=text("0")),
+)
+
+TASK_STATUS_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION task_status_counts_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE task_status_counts SET n = n - 1
+        WHERE project_id = OLD.project_id AND status = OLD.status;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO task_status_counts (project_id, status, n)
+        VALUES (NEW.project_id, NEW.status, 1)
+        ON CONFLICT (project_id, status)
+        DO UPDATE SET n = task_status_counts.n + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TASK_STATUS_COUNTS_TRIGGER = """
+CREATE TRIGGER task_status_counts_sync
+AFTER INSERT OR DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION task_status_counts_sync()
+"""
+
+# Updates that keep project and status leave the counters alone.
+TASK_STATUS_COUNTS_UPDATE_TRIGGER = """
+CREATE TRIGGER task_status_counts_sync_update
+AFTER UPDATE OF project_id, status ON tasks
+FOR EACH ROW
+WHEN (OLD.project_id <> NEW.project_id OR OLD.status <> NEW.status)
+EXECUTE FUNCTION task_status_counts_sync()
+"""
+
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(TASK_STATUS_COUNTS_FUNCTION).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(TASK_STATUS_COUNTS_TRIGGER).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(TASK_STATUS_COUNTS_UPDATE_TRIGGER).execute_if(dialect="postgresql"),
+)
@@ -5,7 +5,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from zentro.project_manager.enums import UserRole, ProjectRole
 from zentro.project_manager.models import User, Task, project_users
-from zentro.auth.dependencies import get_current_user
+from zentro.auth.dependencies import get_current_user_db
+
+# Key in ``session.info`` holding ``{user_id: {project_id: role}}`` for users
+# whose memberships were already loaded on that session, so repeated checks
+# within one request don't hit the database.
+_ROLE_CACHE_KEY = "project_roles"
 
 
 class PermissionChecker:
@@ -19,7 +24,7 @@ class PermissionChecker:
     @staticmethod
     def is_admin(user: User) -> bool:
         """Check if user is admin or super admin"""
-        return user.role in [UserRole.SUPER_ADMIN, UserRole.ADMIN]
+        return user.role >= UserRole.ADMIN
 
     @staticmethod
     async def get_user_project_role(
@@ -27,14 +32,19 @@ class PermissionChecker:
         user_id: int,
         project_id: int
     ) -> Optional[ProjectRole]:
-        """Get user's role in a specific project"""
-        stmt = select(project_users.c.role).where(
-            project_users.c.user_id == user_id,
-            project_users.c.project_id == project_id
-        )
-        result = await session.execute(stmt)
-        row = result.first()
-        return row[0] if row else None
+        """
+        Get user's role in a specific project.
+        The first call on a session loads all of the user's memberships.
+        """
+        cache = session.info.setdefault(_ROLE_CACHE_KEY, {})
+        memberships = cache.get(user_id)
+        if memberships is None:
+            stmt = select(project_users.c.project_id, project_users.c.role).where(
+                project_users.c.user_id == user_id
+            )
+            result = await session.execute(stmt)
+            memberships = cache[user_id] = dict(result.tuples().all())
+        return memberships.get(project_id)
 
     @staticmethod
     async def has_project_access(
@@ -62,15 +72,8 @@ class PermissionChecker:
         if required_role is None:
             return True
 
-        # Check role hierarchy
-        role_hierarchy = {
-            ProjectRole.PROJECT_ADMIN: 5,
-            ProjectRole.PROJECT_MANAGER: 4,
-            ProjectRole.DEVELOPER: 3,
-            ProjectRole.REPORTER: 2,
-            ProjectRole.VIEWER: 1,
-        }
-        return role_hierarchy.get(user_role, 0) >= role_hierarchy.get(required_role, 0)
+        # Roles are ordered by privilege
+        return user_role >= required_role
 
     @staticmethod
     async def check_project_access(
@@ -82,7 +85,6 @@ class PermissionChecker:
         """
         Check project access and raise HTTPException if denied.
         """
-        print("checking project access")
         has_access = await PermissionChecker.has_project_access(
             session, user, project_id, required_role
         )
@@ -94,22 +96,20 @@ class PermissionChecker:
             )
 
     @staticmethod
-    async def get_task_project_id(
+    async def get_task(
         session: AsyncSession,
         task_id: int
-    ) -> int:
-        """Get project_id for a task"""
-        stmt = select(Task.project_id).where(Task.id == task_id)
-        result = await session.execute(stmt)
-        project_id = result.scalar_one_or_none()
+    ) -> Task:
+        """Load a task, whose project_id decides access to it"""
+        task = await session.get(Task, task_id)
 
-        if project_id is None:
+        if task is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
             )
 
-        return project_id
+        return task
 
     @staticmethod
     async def check_task_access(
@@ -117,16 +117,41 @@ class PermissionChecker:
         user: User,
         task_id: int,
         required_role: Optional[ProjectRole] = None
-    ) -> None:
+    ) -> Task:
         """
         Check task access (via project access) and raise HTTPException if denied.
+        Returns the loaded task so callers don't have to fetch it again.
+        The task and the user's role in its project come back in one query.
         """
-        project_id = await PermissionChecker.get_task_project_id(session, task_id)
-        await PermissionChecker.check_project_access(session, user, project_id,
-                                                     required_role)
+        if PermissionChecker.is_admin(user):
+            return await PermissionChecker.get_task(session, task_id)
+
+        stmt = (
+            select(Task, project_users.c.role)
+            .outerjoin(
+                project_users,
+                (project_users.c.project_id == Task.project_id)
+                & (project_users.c.user_id == user.id),
+            )
+            .where(Task.id == task_id)
+        )
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+
+        task, user_role = row
+        if user_role is None or (required_role is not None and user_role < required_role):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions for this project"
+            )
+        return task
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+def require_admin(current_user: User = Depends(get_current_user_db)) -> User:
     """Dependency to require admin or super admin role"""
     if not PermissionChecker.is_admin(current_user):
         raise HTTPException(
@@ -136,7 +161,7 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
-def require_super_admin(current_user: User = Depends(get_current_user)) -> User:
+def require_super_admin(current_user: User = Depends(get_current_user_db)) -> User:
     """Dependency to require super admin role"""
     if not PermissionChecker.is_super_admin(current_user):
         raise HTTPException(
@@ -147,6 +172,16 @@ def require_super_admin(current_user: User = Depends(get_current_user)) -> User:
 
 
 # Helper functions to use in endpoints
+def member_scope(current_user: User) -> Optional[int]:
+    """
+    User id that project-scoped queries must be restricted to (``member_id``
+    in the services), or None for admins, who see every project.
+    """
+    if PermissionChecker.is_admin(current_user):
+        return None
+    return current_user.id
+
+
 async def verify_project_access(
     project_id: int,
     current_user: User,
@@ -166,10 +201,11 @@ async def verify_task_access(
     current_user: User,
     session: AsyncSession,
     required_role: Optional[ProjectRole] = None
-) -> None:
+) -> Task:
     """
     Verify user has access to task (via project). Use this in endpoint body.
+    Returns the task, which can be passed on to the task services.
     """
-    await PermissionChecker.check_task_access(
+    return await PermissionChecker.check_task_access(
         session, current_user, task_id, required_role
     )
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from zentro.project_manager.enums import Priority, TaskStatus
 
@@ -21,8 +21,7 @@ class ProjectOut(BaseModel):
     description: Optional[str]
     creator_id: Optional[int]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EpicCreate(BaseModel):
@@ -41,8 +40,7 @@ class EpicOut(BaseModel):
     description: Optional[str]
     color: Optional[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SprintCreate(BaseModel):
@@ -61,12 +59,17 @@ class SprintOut(BaseModel):
     description: Optional[str]
     is_active: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class TaskCreate(BaseModel):
-    project_id: int
+class ProjectOverviewOut(ProjectOut):
+    """A project with its epics and sprints, for rendering a project page."""
+
+    epics: List[EpicOut]
+    sprints: List[SprintOut]
+
+
+class TaskBase(BaseModel):
     title: str = Field(..., max_length=300)
     description: Optional[str] = None
     epic_id: Optional[int] = None
@@ -80,6 +83,32 @@ class TaskCreate(BaseModel):
     order_index: Optional[int] = 0
 
 
+class TaskCreate(TaskBase):
+    project_id: int
+
+
+class BulkTaskCreateIn(BaseModel):
+    """Several tasks created in one project with one INSERT."""
+
+    tasks: List[TaskBase] = Field(..., min_length=1, max_length=500)
+
+
+class TaskUpdate(BaseModel):
+    """Partial task update; only fields sent by the client are applied."""
+
+    title: Optional[str] = Field(None, max_length=300)
+    description: Optional[str] = None
+    epic_id: Optional[int] = None
+    sprint_id: Optional[int] = None
+    parent_id: Optional[int] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[Priority] = None
+    estimate: Optional[float] = None
+    remaining: Optional[float] = None
+    due_date: Optional[date] = None
+    order_index: Optional[int] = None
+
+
 class TaskOut(BaseModel):
     id: int
     project_id: int
@@ -96,8 +125,18 @@ class TaskOut(BaseModel):
     order_index: int
     due_date: Optional[date]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskAssignment(BaseModel):
+    task_id: int
+    user_id: int
+
+
+class BulkAssignIn(BaseModel):
+    """Several (task, user) assignments applied in one request."""
+
+    assignments: List[TaskAssignment] = Field(..., min_length=1, max_length=500)
 
 
 # -----------------------
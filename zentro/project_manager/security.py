@@ -1,9 +1,15 @@
+import hashlib
+import hmac
+import secrets
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional
 
-from jose import JWTError, jwt
+import jwt
+from jwt import ExpiredSignatureError
 from passlib.context import CryptContext
 from zentro.settings import Settings
+from zentro.utils import TTLCache
 
 settings = Settings()
 
@@ -16,9 +22,27 @@ REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
 # --- Password Hashing ---
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Recently verified (hash, password) pairs, so repeated logins skip bcrypt.
+# Keys are HMACs under a per-process random key, and a changed hash gives a
+# new key. Only successes are kept: wrong passwords always pay full cost.
+_VERIFY_KEY = secrets.token_bytes(32)
+_verified_cache: TTLCache[bytes, bool] = TTLCache(maxsize=1024, ttl=60)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain text password against a hashed one."""
-    return pwd_context.verify(plain_password, hashed_password)
+    key = hmac.new(
+        _VERIFY_KEY,
+        f"{hashed_password}\0{plain_password}".encode(),
+        hashlib.sha256,
+    ).digest()
+    if _verified_cache.get(key):
+        return True
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+    _verified_cache[key] = True
+    return True
+
 
 def get_password_hash(password: str) -> str:
     """Hashes a plain text password."""
@@ -47,3 +71,26 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+# --- JWT Token Decoding ---
+# Decoded payloads keyed by a digest of the raw token, so repeat requests with
+# the same token skip signature verification and JSON parsing.
+_token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(maxsize=10_000, ttl=30)
+
+
+def decode_token(token: str) -> dict[str, Any]:
+    """Decodes and verifies a token, reusing recently decoded payloads.
+
+    Raises jwt.PyJWTError if the token is invalid or has expired.
+    """
+    key = hashlib.sha256(token.encode()).digest()[:16]
+    payload = _token_cache.get(key)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        _token_cache[key] = payload
+    elif payload.get("exp", 0) <= time.time():
+        # cached entries may outlive the token itself
+        _token_cache.pop(key)
+        raise ExpiredSignatureError("Signature has expired.")
+    return payload
@@ -1,19 +1,112 @@
 from __future__ import annotations
 
-from datetime import date
-import random
-from typing import List, Optional, Sequence, Tuple
-
-from sqlalchemy import func, select, update
+import asyncio
+from datetime import date, datetime
+import secrets
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import (
+    Text,
+    bindparam,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    select,
+    text,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, joinedload, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from zentro.project_manager import security
 from zentro.project_manager.enums import Priority, TaskStatus, ProjectRole, UserRole
-from zentro.project_manager.models import Task, User, Project, project_users, Sprint, Epic
+from zentro.project_manager.models import (
+    Epic,
+    Project,
+    Sprint,
+    Task,
+    User,
+    project_users,
+    task_assignees,
+    task_status_counts,
+)
+
+from zentro.utils import (
+    Conflict,
+    Forbidden,
+    NotFound,
+    TTLCache,
+    _ensure_exist,
+    _get_or_404,
+)
+
+
+def _keyset_page(q, id_column, *, after_id=None, limit=None, offset=0):
+    """Order by id and page with ``id > after_id`` when given, else ``offset``."""
+    if after_id is not None:
+        q = q.where(id_column > after_id)
+    elif offset:
+        q = q.offset(offset)
+    q = q.order_by(id_column)
+    if limit is not None:
+        q = q.limit(limit)
+    return q
+
+
+# List responses (TaskOut, EpicOut, SprintOut) only carry columns, so list
+# queries refuse lazy loads: a relationship touched per row would otherwise
+# quietly turn into an N+1 instead of failing loudly.
+_NO_LAZY_LOADS = raiseload("*")
+
+
+def _visible_to(
+    project_id_column,
+    member_id: Optional[int],
+    min_role: Optional[ProjectRole] = None,
+):
+    """Restrict rows to projects ``member_id`` belongs to; ``None`` means all.
+
+    With ``min_role`` the membership must also rank at least that high.
+    Lets endpoints authorize and read or write in one statement; an empty
+    result is then checked separately to tell "no rows" from "no access".
+    """
+    if member_id is None:
+        return true()
+    membership = exists().where(
+        project_users.c.project_id == project_id_column,
+        project_users.c.user_id == member_id,
+    )
+    if min_role is not None:
+        membership = membership.where(project_users.c.role >= min_role)
+    return membership
 
-from zentro.utils import NotFound, _get_or_404, Conflict
+
+async def _ensure_project_role(
+    session: AsyncSession,
+    project_id: int,
+    member_id: Optional[int],
+    min_role: Optional[ProjectRole],
+) -> None:
+    """Raise Forbidden unless ``member_id`` holds ``min_role`` in the project."""
+    if member_id is None:
+        return
+    role = await session.scalar(
+        select(project_users.c.role).where(
+            project_users.c.project_id == project_id,
+            project_users.c.user_id == member_id,
+        )
+    )
+    if role is None or (min_role is not None and role < min_role):
+        raise Forbidden("Insufficient permissions for this project")
 
 
 async def add_user_to_project(
@@ -22,33 +115,26 @@ async def add_user_to_project(
     user_id: int,
     role: ProjectRole = ProjectRole.DEVELOPER,
 ) -> None:
-    """Add a user to a project with specified role"""
-    # Verify project exists
-    project = await session.get(Project, project_id)
-    if not project:
-        raise NotFound(f"Project {project_id} not found")
-
-    # Verify user exists
-    user = await session.get(User, user_id)
-    if not user:
-        raise NotFound(f"User {user_id} not found")
-
-    # Check if user is already in project
-    stmt = select(project_users).where(
-        project_users.c.project_id == project_id,
-        project_users.c.user_id == user_id
+    """
+    Add a user to a project with specified role.
+    One INSERT: the primary key reports an existing membership and the
+    foreign keys a missing project or user.
+    """
+    stmt = (
+        pg_insert(project_users)
+        .values(project_id=project_id, user_id=user_id, role=role)
+        .on_conflict_do_nothing(index_elements=["project_id", "user_id"])
     )
-    result = await session.execute(stmt)
-    if result.first():
+    try:
+        # A savepoint, so a failed insert doesn't discard the caller's transaction.
+        async with session.begin_nested():
+            result = await session.execute(stmt)
+    except IntegrityError:
+        # Only a foreign key can fail here; find out which one for the 404.
+        await _ensure_exist(session, {Project: [project_id], User: [user_id]})
+        raise
+    if result.rowcount == 0:
         raise Conflict(f"User {user_id} is already in project {project_id}")
-
-    # Add user to project
-    stmt = project_users.insert().values(
-        project_id=project_id,
-        user_id=user_id,
-        role=role
-    )
-    await session.execute(stmt)
     await session.commit()
 
 
@@ -109,34 +195,19 @@ async def update_user_global_role(
 
 async def list_projects(
     session: AsyncSession,
-    user_id: int | None = None,
+    *,
+    member_id: int | None = None,
     limit: int = 50,
     offset: int = 0,
+    after_id: int | None = None,
 ) -> list[Project]:
     """
-    List projects. If user_id provided, only return projects the user has access to.
-    Admins see all projects.
-    """
-    if user_id:
-        user = await session.get(User, user_id)
-        if not user:
-            raise NotFound(f"User {user_id} not found")
-
-        # Admins see all projects
-        if user.role in [UserRole.SUPER_ADMIN, UserRole.ADMIN]:
-            stmt = select(Project).limit(limit).offset(offset)
-        else:
-            # Regular users only see projects they're members of
-            stmt = (
-                select(Project)
-                .join(project_users)
-                .where(project_users.c.user_id == user_id)
-                .limit(limit)
-                .offset(offset)
-            )
-    else:
-        # No user specified, return all (for admin use)
-        stmt = select(Project).limit(limit).offset(offset)
+    List projects. If member_id is provided, only return projects that user
+    belongs to; callers pass None for admins, who see all projects.
+    Pass the last id seen as ``after_id`` to page by keyset instead of offset.
+    """
+    stmt = select(Project).where(_visible_to(Project.id, member_id))
+    stmt = _keyset_page(stmt, Project.id, after_id=after_id, limit=limit, offset=offset)
 
     result = await session.execute(stmt)
     return list(result.scalars().all())
@@ -153,27 +224,36 @@ async def create_project(
     Create a project. If creator_id is provided, automatically add them
     as PROJECT_ADMIN.
     """
-    # Your existing project creation logic here
-    project = Project(
-        name=name,
-        key=key,
-        description=description,
-        creator_id=creator_id,
-    )
-    session.add(project)
-    await session.flush()  # Get the project ID
+    if not creator_id:
+        project = Project(name=name, key=key, description=description)
+        session.add(project)
+        await session.commit()
+        return project
 
-    # Automatically add creator as PROJECT_ADMIN
-    if creator_id:
-        stmt = project_users.insert().values(
-            project_id=project.id,
-            user_id=creator_id,
-            role=ProjectRole.PROJECT_ADMIN
+    # Insert the project and add the creator as PROJECT_ADMIN in a single
+    # statement: the membership INSERT reads the new id from a CTE.
+    new_project = (
+        insert(Project)
+        .values(name=name, key=key, description=description, creator_id=creator_id)
+        .returning(*Project.__table__.c)
+        .cte("new_project")
+    )
+    membership = (
+        insert(project_users)
+        .from_select(
+            ["project_id", "user_id", "role"],
+            select(
+                new_project.c.id,
+                literal(creator_id, project_users.c.user_id.type),
+                literal(ProjectRole.PROJECT_ADMIN, project_users.c.role.type),
+            ),
         )
-        await session.execute(stmt)
-
+        .cte("creator_membership")
+    )
+    project = await session.scalar(
+        select(aliased(Project, new_project)).add_cte(membership),
+    )
     await session.commit()
-    await session.refresh(project)
     return project
 
 
@@ -210,14 +290,14 @@ async def create_user(
         password_hash=hashed_password,
         full_name=full_name,
         active=active,
-        refresh_token_param=random.randint(1, 1_000_000_000) # Initialize rtp
+        # Random start; 30 bits leave headroom for password-change increments.
+        refresh_token_param=secrets.randbits(30),
     )
     session.add(user)
     try:
         await session.flush()  # push so integrity errors surface
     except IntegrityError as exc:
         raise Conflict("email or username already exists") from exc
-    await session.refresh(user)
     return user
 
 
@@ -225,65 +305,86 @@ async def get_user(session: AsyncSession, user_id: int) -> User:
     return await _get_or_404(session, User, user_id)
 
 
+# Built once; the compiled SQL is looked up from the engine's statement cache.
+_GET_USER_BY_EMAIL = lambda_stmt(
+    lambda: select(User).where(User.email == bindparam("email")),
+)
+
+
 async def get_user_by_email(session: AsyncSession, email: str) -> Optional[User]:
-    q = select(User).where(User.email == email)
-    result = await session.execute(q)
+    result = await session.execute(_GET_USER_BY_EMAIL, {"email": email})
     return result.scalars().first()
 
 
-async def update_user(session: AsyncSession, user_id: int, **patch) -> User:
-    """Updates a user. Hashes the password if it's being changed."""
-    user = await _get_or_404(session, User, user_id)
-    for k, v in patch.items():
-        if hasattr(user, k):
-            if k == "password" and v is not None:
-                # Special handling for password update
-                setattr(user, "password_hash", security.get_password_hash(v))
-                # When password changes, invalidate old refresh tokens
-                setattr(user, "refresh_token_param", user.refresh_token_param + 1)
-            else:
-                setattr(user, k, v)
-
-    # Update last_login on successful login
-    if "last_login" in patch:
-        user.last_login = patch["last_login"]
+# Columns a patch may set directly; "password" is handled separately.
+_USER_PATCHABLE = frozenset(User.__table__.columns.keys()) - {"id", "password_hash"}
 
-    session.add(user)
-    await session.flush()
-    await session.refresh(user)
+
+async def update_user(session: AsyncSession, user_id: int, **patch) -> User:
+    """
+    Updates a user with a single UPDATE ... RETURNING.
+    Hashes the password if it's being changed.
+    """
+    values = {k: v for k, v in patch.items() if k in _USER_PATCHABLE}
+    if patch.get("password") is not None:
+        values["password_hash"] = security.get_password_hash(patch["password"])
+        # When password changes, invalidate old refresh tokens
+        values["refresh_token_param"] = User.refresh_token_param + 1
+    if not values:
+        return await _get_or_404(session, User, user_id)
+
+    user = await session.scalar(
+        update(User).where(User.id == user_id).values(**values).returning(User),
+    )
+    if user is None:
+        raise NotFound(f"User with id={user_id} not found")
     return user
 
 
 async def delete_user(session: AsyncSession, user_id: int) -> None:
-    # hard delete — adapt to softly delete if you prefer
-    user = await _get_or_404(session, User, user_id)
-    await session.delete(user)
-    await session.flush()
+    """
+    Hard delete in one statement. Foreign keys drop the user's memberships,
+    assignments, chats and follow-ups, and null creator/reporter references.
+    """
+    stmt = delete(User).where(User.id == user_id).returning(User.id)
+    if (await session.execute(stmt)).scalar_one_or_none() is None:
+        raise NotFound(f"User with id={user_id} not found")
+
 
 async def get_project(
     session: AsyncSession,
     project_id: int,
     /,
     *,
-    load_children: bool = True,
+    include_users: bool = False,
+    include_epics: bool = False,
+    include_sprints: bool = False,
+    include_tasks: bool = False,
 ) -> Project:
-    if load_children:
-        q = (
-            select(Project)
-            .options(
-                selectinload(Project.users),
-                selectinload(Project.epics),
-                selectinload(Project.sprints),
-                selectinload(Project.tasks),
-            )
-            .where(Project.id == project_id)
-        )
-        result = await session.execute(q)
-        project = result.scalars().first()
-        if project is None:
-            raise NotFound("Project not found")
-        return project
-    return await _get_or_404(session, Project, project_id)
+    """
+    Get a project, eager-loading only the child collections asked for; any
+    other relationship raises instead of lazy loading.
+    """
+    wanted = {
+        Project.users: include_users,
+        Project.epics: include_epics,
+        Project.sprints: include_sprints,
+        Project.tasks: include_tasks,
+    }
+    options = [selectinload(rel) for rel, include in wanted.items() if include]
+    if not options:
+        return await _get_or_404(session, Project, project_id)
+
+    q = (
+        select(Project)
+        .options(*options, _NO_LAZY_LOADS)
+        .where(Project.id == project_id)
+    )
+    result = await session.execute(q)
+    project = result.scalars().first()
+    if project is None:
+        raise NotFound("Project not found")
+    return project
 
 
 # ---- Epics ----
@@ -298,7 +399,7 @@ async def create_epic(
     end_date=None,
 ) -> Epic:
     # validate project exists
-    await _get_or_404(session, Project, project_id)
+    await _ensure_exist(session, {Project: [project_id]})
     epic = Epic(
         project_id=project_id,
         title=title,
@@ -309,7 +410,6 @@ async def create_epic(
     )
     session.add(epic)
     await session.flush()
-    await session.refresh(epic)
     return epic
 
 async def get_epic(
@@ -341,16 +441,44 @@ async def get_epic(
     # simple path (faster, no relations)
     return await _get_or_404(session, Epic, epic_id)
 
-async def list_epics(session: AsyncSession, project_id: int) -> List[Epic]:
-    q = select(Epic).where(Epic.project_id == project_id)
+async def list_epics(
+    session: AsyncSession,
+    project_id: int,
+    *,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    member_id: Optional[int] = None,
+) -> List[Epic]:
+    q = select(Epic).options(_NO_LAZY_LOADS).where(
+        Epic.project_id == project_id,
+        _visible_to(Epic.project_id, member_id),
+    )
+    q = _keyset_page(q, Epic.id, after_id=after_id, limit=limit)
     result = await session.execute(q)
     return result.scalars().all()
 
 
-async def delete_epic(session: AsyncSession, epic_id: int) -> None:
-    epic = await _get_or_404(session, Epic, epic_id)
-    await session.delete(epic)
-    await session.flush()
+async def delete_epic(
+    session: AsyncSession,
+    epic_id: int,
+    *,
+    member_id: Optional[int] = None,
+    min_role: Optional[ProjectRole] = None,
+) -> None:
+    """
+    Delete an epic in one statement, provided ``member_id`` holds ``min_role``
+    in its project. The epic is only looked up when nothing was deleted, to
+    tell a missing epic from a forbidden one. Its tasks keep existing, with
+    epic_id set to NULL by the foreign key.
+    """
+    stmt = (
+        delete(Epic)
+        .where(Epic.id == epic_id, _visible_to(Epic.project_id, member_id, min_role))
+        .returning(Epic.id)
+    )
+    if (await session.execute(stmt)).scalar_one_or_none() is None:
+        await _ensure_exist(session, {Epic: [epic_id]})
+        raise Forbidden("Insufficient permissions for this project")
 
 
 # ---- Sprints ----
@@ -364,7 +492,7 @@ async def create_sprint(
     end_date=None,
     is_active: bool = False,
 ) -> Sprint:
-    await _get_or_404(session, Project, project_id)
+    await _ensure_exist(session, {Project: [project_id]})
     sprint = Sprint(
         project_id=project_id,
         name=name,
@@ -375,12 +503,22 @@ async def create_sprint(
     )
     session.add(sprint)
     await session.flush()
-    await session.refresh(sprint)
     return sprint
 
 
-async def list_sprints(session: AsyncSession, project_id: int) -> List[Sprint]:
-    q = select(Sprint).where(Sprint.project_id == project_id)
+async def list_sprints(
+    session: AsyncSession,
+    project_id: int,
+    *,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    member_id: Optional[int] = None,
+) -> List[Sprint]:
+    q = select(Sprint).options(_NO_LAZY_LOADS).where(
+        Sprint.project_id == project_id,
+        _visible_to(Sprint.project_id, member_id),
+    )
+    q = _keyset_page(q, Sprint.id, after_id=after_id, limit=limit)
     result = await session.execute(q)
     return result.scalars().all()
 
@@ -389,22 +527,38 @@ async def set_active_sprint(
     session: AsyncSession,
     project_id: int,
     sprint_id: int,
+    *,
+    member_id: Optional[int] = None,
+    min_role: Optional[ProjectRole] = None,
 ) -> Sprint:
-    # deactivate other sprints in the project, activate this one
-    await _get_or_404(session, Project, project_id)
-    target = await _get_or_404(session, Sprint, sprint_id)
-    if target.project_id != project_id:
-        raise Conflict("Sprint does not belong to project")
-
-    q_deactivate = (
-        update(Sprint).where(Sprint.project_id == project_id).values(is_active=False)
-    )
-    await session.execute(q_deactivate)
-    target.is_active = True
-    session.add(target)
-    await session.flush()
-    await session.refresh(target)
-    return target
+    """
+    Activate a sprint and deactivate the rest of the project's sprints with a
+    single UPDATE, which also checks ``member_id`` holds ``min_role``.
+    Only when nothing matched are the project, sprint and role looked up to
+    report why.
+    """
+    target = aliased(Sprint)
+    sprint_in_project = exists().where(
+        target.id == sprint_id, target.project_id == project_id,
+    )
+    stmt = (
+        update(Sprint)
+        .where(
+            Sprint.project_id == project_id,
+            sprint_in_project,
+            _visible_to(Sprint.project_id, member_id, min_role),
+        )
+        .values(is_active=Sprint.id == sprint_id)
+        .returning(Sprint)
+        .execution_options(populate_existing=True)
+    )
+    for sprint in (await session.execute(stmt)).scalars():
+        if sprint.id == sprint_id:
+            return sprint
+
+    await _ensure_project_role(session, project_id, member_id, min_role)
+    await _ensure_exist(session, {Project: [project_id], Sprint: [sprint_id]})
+    raise Conflict("Sprint does not belong to project")
 
 
 # ---- Tasks ----
@@ -425,16 +579,17 @@ async def create_task(
     reporter_id: Optional[int] = None,
     order_index: int = 0,
 ) -> Task:
-    # ensure foreign keys exist (light validation)
-    await _get_or_404(session, Project, project_id)
-    if epic_id is not None:
-        await _get_or_404(session, Epic, epic_id)
-    if sprint_id is not None:
-        await _get_or_404(session, Sprint, sprint_id)
-    if parent_id is not None:
-        await _get_or_404(session, Task, parent_id)
-    if reporter_id is not None:
-        await _get_or_404(session, User, reporter_id)
+    # ensure foreign keys exist (light validation), all in one round trip
+    await _ensure_exist(
+        session,
+        {
+            Project: [project_id],
+            Epic: [epic_id] if epic_id is not None else [],
+            Sprint: [sprint_id] if sprint_id is not None else [],
+            Task: [parent_id] if parent_id is not None else [],
+            User: [reporter_id] if reporter_id is not None else [],
+        },
+    )
     task = Task(
         project_id=project_id,
         title=title,
@@ -452,26 +607,66 @@ async def create_task(
     )
     session.add(task)
     await session.flush()
-    await session.refresh(task)
     return task
 
 
+async def create_tasks_bulk(
+    session: AsyncSession,
+    records: Sequence[dict],
+) -> List[Task]:
+    """Create many tasks (e.g. an import) with one ORM bulk INSERT.
+
+    ``records`` hold ``create_task`` keyword arguments. Rows are sent as
+    multi-row INSERT ... RETURNING batches rather than one flush per object,
+    and the tasks come back in the order of ``records``.
+    """
+    if not records:
+        return []
+
+    def _ids(key: str) -> list[int]:
+        return [record[key] for record in records if record.get(key) is not None]
+
+    await _ensure_exist(
+        session,
+        {
+            Project: _ids("project_id"),
+            Epic: _ids("epic_id"),
+            Sprint: _ids("sprint_id"),
+            Task: _ids("parent_id"),
+            User: _ids("reporter_id"),
+        },
+    )
+    result = await session.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True),
+        list(records),
+    )
+    return result.all()
+
+
 async def get_task(
     session: AsyncSession,
     task_id: int,
     /,
     *,
-    load_relations: bool = True,
+    load_relations: bool = False,
+    task: Optional[Task] = None,
 ) -> Task:
+    """
+    If load_relations=True, eager-load assignees, project, epic, sprint and reporter.
+    The many-to-one relations are joined into the task's SELECT; only the
+    assignees collection takes a second query.
+    """
+    if task is not None and not load_relations:
+        return task
     if load_relations:
         q = (
             select(Task)
             .options(
+                joinedload(Task.project, innerjoin=True),
+                joinedload(Task.epic),
+                joinedload(Task.sprint),
+                joinedload(Task.reporter),
                 selectinload(Task.assignees),
-                selectinload(Task.project),
-                selectinload(Task.epic),
-                selectinload(Task.sprint),
-                selectinload(Task.reporter),
             )
             .where(Task.id == task_id)
         )
@@ -483,6 +678,31 @@ async def get_task(
     return await _get_or_404(session, Task, task_id)
 
 
+async def load_task_tree(session: AsyncSession, root_id: int) -> Task:
+    """
+    Load a task and all of its descendants with one recursive query.
+
+    Every ``subtasks`` collection in the tree is filled in, so the whole tree
+    can be walked without further queries.
+    """
+    tree = select(Task.id).where(Task.id == root_id).cte("task_tree", recursive=True)
+    # UNION (not UNION ALL) stops on a parent_id cycle instead of looping.
+    tree = tree.union(select(Task.id).where(Task.parent_id == tree.c.id))
+    tasks = (
+        await session.scalars(select(Task).join(tree, Task.id == tree.c.id).order_by(Task.id))
+    ).all()
+    if not tasks:
+        raise NotFound("Task not found")
+
+    children: Dict[int, List[Task]] = {task.id: [] for task in tasks}
+    for task in tasks:
+        if task.id != root_id and task.parent_id in children:
+            children[task.parent_id].append(task)
+    for task in tasks:
+        set_committed_value(task, "subtasks", children[task.id])
+    return next(task for task in tasks if task.id == root_id)
+
+
 async def list_tasks(
     session: AsyncSession,
     *,
@@ -492,8 +712,14 @@ async def list_tasks(
     priority: Optional[Priority] = None,
     limit: int = 100,
     offset: int = 0,
+    after_id: Optional[int] = None,
+    member_id: Optional[int] = None,
 ) -> List[Task]:
-    q = select(Task)
+    q = (
+        select(Task)
+        .options(_NO_LAZY_LOADS)
+        .where(_visible_to(Task.project_id, member_id))
+    )
     if project_id is not None:
         q = q.where(Task.project_id == project_id)
     if sprint_id is not None:
@@ -502,67 +728,235 @@ async def list_tasks(
         q = q.where(Task.status == status)
     if priority is not None:
         q = q.where(Task.priority == priority)
-    q = q.offset(offset).limit(limit)
+    q = _keyset_page(q, Task.id, after_id=after_id, limit=limit, offset=offset)
     result = await session.execute(q)
     return result.scalars().all()
 
 
-async def update_task(session: AsyncSession, task_id: int, **patch) -> Task:
-    task = await _get_or_404(session, Task, task_id)
+async def count_tasks(
+    session: AsyncSession,
+    *,
+    project_id: Optional[int] = None,
+    sprint_id: Optional[int] = None,
+    status: Optional[TaskStatus] = None,
+    priority: Optional[Priority] = None,
+) -> int:
+    """Count tasks matching the same filters as ``list_tasks``."""
+    q = select(func.count(Task.id))
+    if project_id is not None:
+        q = q.where(Task.project_id == project_id)
+    if sprint_id is not None:
+        q = q.where(Task.sprint_id == sprint_id)
+    if status is not None:
+        q = q.where(Task.status == status)
+    if priority is not None:
+        q = q.where(Task.priority == priority)
+    return await session.scalar(q)
+
+
+async def update_task(
+    session: AsyncSession,
+    task_id: int,
+    /,
+    *,
+    task: Optional[Task] = None,
+    **patch,
+) -> Task:
+    if task is None:
+        task = await _get_or_404(session, Task, task_id)
     for k, v in patch.items():
         if hasattr(task, k):
             setattr(task, k, v)
     session.add(task)
     await session.flush()
-    await session.refresh(task)
     return task
 
 
 async def delete_task(session: AsyncSession, task_id: int) -> None:
+    """
+    Delete in one statement. Foreign keys drop the task's assignments and
+    follow-ups and detach its subtasks (parent_id set to NULL).
+    """
+    stmt = delete(Task).where(Task.id == task_id).returning(Task.id)
+    if (await session.execute(stmt)).scalar_one_or_none() is None:
+        raise NotFound(f"Task with id={task_id} not found")
+
+
+async def assign_task(session: AsyncSession, task_id: int, user_id: int) -> None:
+    """
+    Assign in one INSERT ... SELECT that only yields a row when both the task
+    and the user exist; an existing assignment is left as it is. Only when
+    nothing was inserted are the ids checked, to report a missing one.
+    """
+    stmt = (
+        pg_insert(task_assignees)
+        .from_select(
+            ["task_id", "user_id"],
+            select(Task.id, User.id).where(Task.id == task_id, User.id == user_id),
+        )
+        .on_conflict_do_nothing()
+    )
+    if (await session.execute(stmt)).rowcount:
+        return
+    await _ensure_exist(session, {Task: [task_id], User: [user_id]})
+
+
+async def unassign_task(
+    session: AsyncSession,
+    task_id: int,
+    user_id: int,
+    *,
+    member_id: Optional[int] = None,
+    min_role: Optional[ProjectRole] = None,
+) -> None:
+    """
+    Remove the assignment in one DELETE, which also checks ``member_id``
+    holds ``min_role`` in the task's project. Only when no row was removed
+    are the task, role and user looked up to report why.
+    """
+    stmt = delete(task_assignees).where(
+        task_assignees.c.task_id == task_id,
+        task_assignees.c.user_id == user_id,
+        Task.id == task_assignees.c.task_id,
+        _visible_to(Task.project_id, member_id, min_role),
+    )
+    if (await session.execute(stmt)).rowcount:
+        return
+
     task = await _get_or_404(session, Task, task_id)
-    await session.delete(task)
-    await session.flush()
+    await _ensure_project_role(session, task.project_id, member_id, min_role)
+    await _ensure_exist(session, {User: [user_id]})
 
 
-async def _get_task_with_assignees(session: AsyncSession, task_id: int) -> Task:
-    q = select(Task).options(selectinload(Task.assignees)).where(Task.id == task_id)
-    result = await session.execute(q)
-    task = result.scalar_one_or_none()
-    if not task:
-        raise NotFound
-    return task
+async def _ensure_tasks_accessible(
+    session: AsyncSession,
+    task_ids: set[int],
+    member_id: Optional[int],
+    min_role: Optional[ProjectRole],
+) -> None:
+    """Check, in one query, that ``member_id`` holds ``min_role`` on every task.
 
+    Raises NotFound for tasks that don't exist and Forbidden for the rest.
+    """
+    allowed = await session.scalars(
+        select(Task.id).where(
+            Task.id.in_(task_ids),
+            _visible_to(Task.project_id, member_id, min_role),
+        )
+    )
+    denied = task_ids - set(allowed)
+    if denied:
+        await _ensure_exist(session, {Task: denied})
+        raise Forbidden("Insufficient permissions for this project")
 
-async def assign_task(session: AsyncSession, task_id: int, user_id: int) -> None:
-    task = await _get_task_with_assignees(session, task_id)
-    user = await _get_or_404(session, User, user_id)
-    if user.id not in {u.id for u in task.assignees}:
-        task.assignees.append(user)
-        session.add(task)
-        await session.flush()
+
+async def assign_tasks_bulk(
+    session: AsyncSession,
+    pairs: Sequence[tuple[int, int]],
+    *,
+    member_id: Optional[int] = None,
+    min_role: Optional[ProjectRole] = None,
+) -> None:
+    """
+    Apply many ``(task_id, user_id)`` assignments with one authorization
+    query, one user existence check and one INSERT. Existing assignments are
+    left as they are.
+    """
+    pairs = set(pairs)
+    await _ensure_tasks_accessible(
+        session, {task_id for task_id, _ in pairs}, member_id, min_role,
+    )
+    await _ensure_exist(session, {User: [user_id for _, user_id in pairs]})
+    await session.execute(
+        pg_insert(task_assignees)
+        .values([{"task_id": task_id, "user_id": user_id} for task_id, user_id in pairs])
+        .on_conflict_do_nothing()
+    )
 
 
-async def unassign_task(session: AsyncSession, task_id: int, user_id: int) -> None:
-    task = await _get_or_404(session, Task, task_id)
-    user = await _get_or_404(session, User, user_id)
-    if user in task.assignees:
-        task.assignees.remove(user)
-        session.add(task)
-        await session.flush()
+async def unassign_tasks_bulk(
+    session: AsyncSession,
+    pairs: Sequence[tuple[int, int]],
+    *,
+    member_id: Optional[int] = None,
+    min_role: Optional[ProjectRole] = None,
+) -> None:
+    """Remove many ``(task_id, user_id)`` assignments; missing ones are ignored."""
+    pairs = set(pairs)
+    await _ensure_tasks_accessible(
+        session, {task_id for task_id, _ in pairs}, member_id, min_role,
+    )
+    await session.execute(
+        delete(task_assignees).where(
+            tuple_(task_assignees.c.task_id, task_assignees.c.user_id).in_(pairs),
+        )
+    )
 
 
 # ---- Simple reporting / counts ----
 async def count_tasks_by_status(
     session: AsyncSession,
     project_id: int,
-) -> List[Tuple[TaskStatus, int]]:
-    q = (
-        select(Task.status, func.count(Task.id))
-        .where(Task.project_id == project_id)
-        .group_by(Task.status)
+    *,
+    member_id: Optional[int] = None,
+) -> Dict[str, int]:
+    """Task counts keyed by status value (e.g. ``"in_progress"``).
+
+    Reads the trigger-maintained ``task_status_counts`` counters instead of
+    grouping the project's tasks. The enum label is stringified in SQL (labels
+    are the upper-cased values), so rows come back ready to be used as the
+    response body.
+    """
+    counts = task_status_counts.c
+    q = select(func.lower(cast(counts.status, Text)), counts.n).where(
+        counts.project_id == project_id,
+        counts.n > 0,
+        _visible_to(counts.project_id, member_id),
     )
     res = await session.execute(q)
-    return [(row[0], row[1]) for row in res.all()]
+    return dict(res.tuples().all())
+
+
+async def count_tasks_by_status_for_projects(
+    session: AsyncSession,
+    project_ids: Sequence[int],
+    *,
+    member_id: Optional[int] = None,
+) -> Dict[int, Dict[str, int]]:
+    """``count_tasks_by_status`` for several projects in one query.
+
+    Projects without tasks, or not visible to ``member_id``, are left out.
+    """
+    counts = task_status_counts.c
+    q = select(
+        counts.project_id, func.lower(cast(counts.status, Text)), counts.n,
+    ).where(
+        counts.project_id.in_(project_ids),
+        counts.n > 0,
+        _visible_to(counts.project_id, member_id),
+    )
+    by_project: Dict[int, Dict[str, int]] = {}
+    for project_id, status, n in (await session.execute(q)).tuples():
+        by_project.setdefault(project_id, {})[status] = n
+    return by_project
+
+
+async def rebuild_task_status_counts(session: AsyncSession) -> None:
+    """Recompute every ``task_status_counts`` row from the tasks table.
+
+    Only needed if the counters drifted (e.g. the trigger was disabled during
+    a manual data fix). Task writes wait on the lock until the commit.
+    """
+    await session.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+    await session.execute(delete(task_status_counts))
+    await session.execute(
+        insert(task_status_counts).from_select(
+            ["project_id", "status", "n"],
+            select(Task.project_id, Task.status, func.count()).group_by(
+                Task.project_id, Task.status,
+            ),
+        )
+    )
 
 
 # ---- Search helpers (basic) ----
@@ -571,33 +965,98 @@ async def search_tasks(
     project_id: int,
     term: str,
     limit: int = 50,
+    *,
+    member_id: Optional[int] = None,
 ) -> List[Task]:
-    # basic full-text could be added later; keep it simple for MVP
+    result = await session.execute(
+        _search_tasks_query(project_id, term, limit, member_id=member_id),
+    )
+    return result.scalars().all()
+
+
+async def stream_search_tasks(
+    session: AsyncSession,
+    project_id: int,
+    term: str,
+    limit: int = 50,
+) -> AsyncIterator[Task]:
+    """Like ``search_tasks`` but yields rows as they arrive from the server."""
+    result = await session.stream_scalars(
+        _search_tasks_query(project_id, term, limit),
+        execution_options={"yield_per": 100},
+    )
+    async for task in result:
+        yield task
+
+
+def _search_tasks_query(
+    project_id: int,
+    term: str,
+    limit: int,
+    *,
+    member_id: Optional[int] = None,
+):
+    # Substring match; the trigram GIN indexes on title/description serve it.
     like_term = f"%{term}%"
-    q = (
+    return (
         select(Task)
+        .options(_NO_LAZY_LOADS)
         .where(
             Task.project_id == project_id,
             (Task.title.ilike(like_term)) | (Task.description.ilike(like_term)),
+            _visible_to(Task.project_id, member_id),
         )
         .limit(limit)
     )
-    result = await session.execute(q)
-    return result.scalars().all()
 
 
 # ---- AI / Agent hooks (placeholders) ----
 # These functions are intentionally lightweight. When you add your agent layer,
 # it can call into these hooks to perform automated actions (e.g., classify tasks,
 # suggest priorities, auto-assign), or we can add event emitters here.
-async def suggest_priority_for_task(session: AsyncSession, task_id: int) -> Priority:
+# Suggestions keyed by (task id, updated_at), so any edit to the task misses.
+_priority_cache: TTLCache[tuple[int, datetime], Priority] = TTLCache(
+    maxsize=20_000,
+    ttl=120,
+)
+# In-flight computations, so concurrent requests for the same task share one.
+_priority_inflight: dict[tuple[int, datetime], asyncio.Future[Priority]] = {}
+
+
+async def _compute_priority(task: Task) -> Priority:
+    # TODO: call an AI service / heuristic engine to compute priority
+    return task.priority
+
+
+async def suggest_priority_for_task(
+    session: AsyncSession,
+    task_id: int,
+    /,
+    *,
+    task: Optional[Task] = None,
+) -> Priority:
     """
     Placeholder: compute a suggested priority for the task. For now, return current.
     Agent layer can replace this with ML/heuristic callouts.
+    Results are cached until the task changes; concurrent calls are coalesced.
+    Pass an already loaded ``task`` to skip the lookup.
     """
-    task = await _get_or_404(session, Task, task_id)
-    # TODO: call an AI service / heuristic engine to compute priority
-    return task.priority
+    if task is None:
+        task = await _get_or_404(session, Task, task_id)
+    key = (task.id, task.updated_at)
+    priority = _priority_cache.get(key)
+    if priority is not None:
+        return priority
+
+    inflight = _priority_inflight.get(key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(_compute_priority(task))
+        _priority_inflight[key] = inflight
+        inflight.add_done_callback(lambda _: _priority_inflight.pop(key, None))
+    # shield: one caller going away must not cancel the others' computation
+    priority = await asyncio.shield(inflight)
+    _priority_cache[key] = priority
+    return priority
 
 
 # ---- Convenience transactional wrapper ----
@@ -612,17 +1071,49 @@ async def run_in_transaction(session: AsyncSession, coro):
         return await coro(session)
 
 
-async def get_tasks_past_due_date(session: AsyncSession) -> List[Task]:
+async def get_tasks_past_due_date(session: AsyncSession) -> AsyncIterator[dict]:
     """
-    Retrieves tasks that are past their due_date and are not yet 'DONE'.
-    Eagerly loads assignees to prevent N+1 queries.
+    Yields tasks that are past their due_date and are not yet 'DONE'.
+    Each task is a plain dict whose ``assignees`` lists the assigned users.
+
+    Tuples from one outer join to the assignees are streamed in id order and
+    grouped as they arrive, so memory stays bounded by the fetch batch rather
+    than the number of overdue tasks.
     """
     today = date.today()
     q = (
-        select(Task)
+        select(
+            Task.id,
+            Task.title,
+            Task.due_date,
+            Task.status,
+            User.id.label("user_id"),
+            User.email,
+            User.full_name,
+        )
+        .select_from(Task)
+        .outerjoin(task_assignees, task_assignees.c.task_id == Task.id)
+        .outerjoin(User, User.id == task_assignees.c.user_id)
         .where(Task.due_date < today)
         .where(Task.status != TaskStatus.DONE)
-        .options(selectinload(Task.assignees))  # Eager load assignees
+        .order_by(Task.id)
     )
-    result = await session.execute(q)
-    return result.scalars().all()
+    result = await session.stream(q, execution_options={"yield_per": 500})
+    task: Optional[dict] = None
+    async for row in result:
+        if task is None or task["id"] != row.id:
+            if task is not None:
+                yield task
+            task = {
+                "id": row.id,
+                "title": row.title,
+                "due_date": row.due_date,
+                "status": row.status,
+                "assignees": [],
+            }
+        if row.user_id is not None:
+            task["assignees"].append(
+                {"id": row.user_id, "email": row.email, "full_name": row.full_name},
+            )
+    if task is not None:
+        yield task
@@ -0,0 +1,219 @@
+import hashlib
+import re
+from typing import Optional, Sequence
+
+import orjson
+from jwt import PyJWTError
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from zentro.project_manager import security
+
+GENERATION_KEY = "response-cache:generation"
+
+# Methods whose success invalidates the cache; OPTIONS and HEAD don't write.
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# Response headers kept with a cached body, besides every ``x-*`` header.
+_STORED_HEADERS = (b"etag", b"cache-control")
+
+
+async def invalidate_response_cache(redis_pool: Optional[object]) -> None:
+    """
+    Drop every cached response by bumping the generation counter.
+
+    The middleware does this for writes under its prefix; call it after
+    committing writes that happen elsewhere but change cached payloads.
+    """
+    if redis_pool is None:
+        return
+    try:
+        async with Redis(connection_pool=redis_pool) as redis:
+            await redis.incr(GENERATION_KEY)
+    except RedisError as exc:
+        logger.warning("Response cache unavailable: {}", exc)
+
+
+class ResponseCacheMiddleware:
+    """
+    Caches successful GET responses in redis.
+
+    Only paths under ``prefix`` matching one of ``rules`` are cached, each
+    with its own TTL. Entries are keyed by the Authorization header, so users
+    never see each other's responses. Any successful POST, PUT, PATCH or
+    DELETE under ``prefix`` bumps a generation counter, which invalidates
+    every cached entry at once.
+
+    Requests pass straight through when redis is not configured or fails.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        prefix: str,
+        rules: Sequence[tuple[str, int]],
+    ) -> None:
+        self.app = app
+        self.prefix = prefix
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in rules]
+
+    def _ttl_for(self, path: str) -> Optional[int]:
+        for pattern, ttl in self.rules:
+            if pattern.fullmatch(path):
+                return ttl
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        redis_pool = getattr(scope["app"].state, "redis_pool", None)
+        if redis_pool is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in _WRITE_METHODS:
+            await self._invalidate_on_success(redis_pool, scope, receive, send)
+            return
+        if scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        ttl = self._ttl_for(scope["path"])
+        if ttl is None or not self._has_valid_token(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with Redis(connection_pool=redis_pool) as redis:
+                generation = await redis.get(GENERATION_KEY) or b"0"
+                key = self._key(scope, generation)
+                cached = await redis.get(key)
+        except RedisError as exc:
+            logger.warning("Response cache unavailable: {}", exc)
+            await self.app(scope, receive, send)
+            return
+
+        if cached is not None:
+            await self._send_cached(cached, scope, send)
+            return
+
+        await self._call_and_store(redis_pool, key, ttl, scope, receive, send)
+
+    @staticmethod
+    def _has_valid_token(scope: Scope) -> bool:
+        # Never serve a cached entry for a token that is no longer valid;
+        # such requests go to the app, which answers with 401.
+        authorization = dict(scope["headers"]).get(b"authorization", b"").decode()
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            security.decode_token(token)
+        except PyJWTError:
+            return False
+        return True
+
+    def _key(self, scope: Scope, generation: bytes) -> str:
+        headers = dict(scope["headers"])
+        digest = hashlib.sha256()
+        digest.update(headers.get(b"authorization", b""))
+        digest.update(b"\0")
+        digest.update(scope["path"].encode())
+        digest.update(b"?")
+        digest.update(scope["query_string"])
+        return f"response-cache:{generation.decode()}:{digest.hexdigest()}"
+
+    @staticmethod
+    async def _send_cached(cached: bytes, scope: Scope, send: Send) -> None:
+        # Entries are stored as "<json list of stored headers>\n<body>".
+        raw_headers, _, body = cached.partition(b"\n")
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in orjson.loads(raw_headers)
+        ]
+        etag = next((v for name, v in headers if name.lower() == b"etag"), None)
+        if_none_match = dict(scope["headers"]).get(b"if-none-match", b"")
+        if etag is not None and etag in (
+            tag.strip() for tag in if_none_match.split(b",")
+        ):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [(b"x-cache", b"hit"), *headers],
+                },
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-cache", b"hit"),
+                    *headers,
+                ],
+            },
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _call_and_store(
+        self,
+        redis_pool: object,
+        key: str,
+        ttl: int,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        status_code = 0
+        headers: list[tuple[str, str]] = []
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                    if name.lower().startswith(b"x-")
+                    or name.lower() in _STORED_HEADERS
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        if status_code != 200:
+            return
+        try:
+            async with Redis(connection_pool=redis_pool) as redis:
+                entry = orjson.dumps(headers) + b"\n" + b"".join(chunks)
+                await redis.set(key, entry, ex=ttl)
+        except RedisError as exc:
+            logger.warning("Response cache unavailable: {}", exc)
+
+    async def _invalidate_on_success(
+        self,
+        redis_pool: object,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        async def send_wrapper(message: Message) -> None:
+            # Invalidate before the client sees the response, so a read issued
+            # right after a write can't be served a stale entry.
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await invalidate_response_cache(redis_pool)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
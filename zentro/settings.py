@@ -35,6 +35,8 @@ class Settings(BaseSettings):
     workers_count: int = 1
     # Enable uvicorn reloading
     reload: bool = False
+    # Max concurrent connections per worker before uvicorn answers 503
+    limit_concurrency: Optional[int] = 2048
 
     # Current environment
     environment: str = "dev"
@@ -50,6 +52,19 @@ class Settings(BaseSettings):
     db_pass: str = "zentro"
     db_base: str = "zentro"
     db_echo: bool = False
+    # Each process keeps one pool of up to pool_size + max_overflow connections;
+    # workers_count times that must fit in Postgres' max_connections (100 by
+    # default) with room left for migrations, the agent checkpointer and admin.
+    db_pool_size: int = 15
+    db_max_overflow: int = 8
+    # Fail fast when the pool is exhausted instead of queueing for 30s, and
+    # replace connections before server/proxy idle timeouts drop them.
+    db_pool_timeout: float = 5
+    db_pool_recycle: int = 300
+    db_query_cache_size: int = 1200
+    # asyncpg prepared statements kept per connection; set to 0 behind a
+    # transaction-pooling pgbouncer, which can't route them.
+    db_prepared_statement_cache_size: int = 500
 
     # Variables for Redis
     redis_host: str = "zentro-redis"
@@ -79,6 +94,8 @@ class Settings(BaseSettings):
     # Grpc endpoint for opentelemetry.
     # E.G. http://localhost:4317
     opentelemetry_endpoint: Optional[str] = None
+    # Share of root traces recorded; child spans follow their parent's decision.
+    opentelemetry_sample_rate: float = 1.0
 
     nvidia_api_key: Optional[str] = None
 
@@ -91,7 +108,7 @@ class Settings(BaseSettings):
     secret_key: str = "foo"
     access_token_expire_minutes: int = 1
     refresh_token_expire_days: int = 14
-    hash_algorithm: str = "sha256"
+    hash_algorithm: str = "HS256"
 
     @property
     def db_url(self) -> URL:
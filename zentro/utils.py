@@ -1,7 +1,8 @@
-from functools import wraps
-from typing import TypeVar, Callable, Any, cast
+import time
+from typing import TypeVar, Generic, Hashable, Optional
 
-from fastapi import HTTPException, status
+from sqlalchemy import Integer, any_, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -17,6 +18,10 @@ class Conflict(ServiceError):
     pass
 
 
+class Forbidden(ServiceError):
+    pass
+
+
 # ---- Utilities ----
 async def _get_or_404(session: AsyncSession, model, pk: int):
     obj = await session.get(model, pk)
@@ -25,6 +30,73 @@ async def _get_or_404(session: AsyncSession, model, pk: int):
     return obj
 
 
+async def _ensure_exist(session: AsyncSession, ids_by_model: dict) -> None:
+    """Check that every ``{Model: ids}`` primary key exists in one round trip.
+
+    Builds ``unnest(ids) EXCEPT SELECT id ... WHERE id = ANY(ids)`` per model and
+    UNION ALLs them, so only the missing ids come back.
+    """
+    parts = []
+    for model, model_ids in ids_by_model.items():
+        ids = sorted(set(model_ids))
+        if not ids:
+            continue
+        param = literal(ids, ARRAY(Integer))
+        # render_derived() names the column: ``AS anon_1(id)``, not ``AS anon_1``
+        requested = func.unnest(param).table_valued("id").render_derived()
+        name = literal(model.__name__)
+        parts.append(
+            select(name.label("model"), requested.c.id).except_(
+                select(name, model.id).where(model.id == any_(param)),
+            ),
+        )
+    if not parts:
+        return
+
+    q = parts[0] if len(parts) == 1 else union_all(*parts)
+    missing = (await session.execute(q)).first()
+    if missing is not None:
+        raise NotFound(f"{missing.model} with id={missing.id} not found")
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Small in-process cache whose entries expire ``ttl`` seconds after being set.
+
+    When full, the oldest entry is evicted. Not shared between workers.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict[K, tuple[float, V]] = {}
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._data.pop(key, None)
+        if len(self._data) >= self.maxsize:
+            # dicts keep insertion order, so the first key is the oldest entry
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
 
-F = TypeVar("F", bound=Callable[..., Any])
+    def clear(self) -> None:
+        self._data.clear()
 
+    def __len__(self) -> int:
+        return len(self._data)
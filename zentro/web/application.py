@@ -2,18 +2,53 @@ import logging
 from importlib import metadata
 
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import UJSONResponse
+from fastapi.responses import ORJSONResponse
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 
+from zentro.services.redis.cache import ResponseCacheMiddleware
 from zentro.settings import settings
+from zentro.utils import Conflict, Forbidden, NotFound, ServiceError
 from zentro.web.api.router import api_router
 from zentro.web.lifespan import lifespan_setup
 
 
+_SERVICE_ERROR_STATUS = {
+    NotFound: status.HTTP_404_NOT_FOUND,
+    Forbidden: status.HTTP_403_FORBIDDEN,
+    Conflict: status.HTTP_409_CONFLICT,
+}
+
+
+async def service_error_handler(request: Request, exc: ServiceError) -> ORJSONResponse:
+    """
+    Translate errors raised by services into HTTP responses.
+
+    NotFound becomes 404, Forbidden 403, Conflict 409 and any other
+    ServiceError 400.
+    Subclasses map like their nearest listed base.
+    """
+    status_code = next(
+        (_SERVICE_ERROR_STATUS[cls] for cls in type(exc).__mro__ if cls in _SERVICE_ERROR_STATUS),
+        status.HTTP_400_BAD_REQUEST,
+    )
+    return ORJSONResponse(status_code=status_code, content={"detail": str(exc)})
+
+
+def _assert_unique_routes(app: FastAPI) -> None:
+    """Fail at startup if a router got included twice or two handlers clash."""
+    seen = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            key = (method, route.path)
+            if key in seen:
+                raise RuntimeError(f"Route {method} {route.path} is registered twice")
+            seen.add(key)
+
+
 def get_app() -> FastAPI:
     """
     Get FastAPI application.
@@ -46,10 +81,29 @@ def get_app() -> FastAPI:
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
-        default_response_class=UJSONResponse,
+        default_response_class=ORJSONResponse,
         # swagger_ui_parameters={"persistAuthorization": True} 
     )
 
+    # Service errors are translated once here instead of per endpoint.
+    app.add_exception_handler(ServiceError, service_error_handler)
+
+    # Cache read-heavy project endpoints; search is left out (high-cardinality q).
+    # Added before CORS so it runs inside it and cache hits get CORS headers.
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        prefix="/api/projects",
+        rules=[
+            (r"/api/projects", 30),
+            (r"/api/projects/\d+", 10),
+            (r"/api/projects/\d+/(epics|sprints)", 60),
+            (r"/api/projects/\d+/overview", 10),
+            (r"/api/projects/\d+/tasks", 10),
+            (r"/api/projects/\d+/task-counts", 15),
+            (r"/api/projects/tasks/\d+", 10),
+        ],
+    )
+
     origins = settings.origins
     app.add_middleware(
         CORSMiddleware,
@@ -61,5 +115,6 @@ def get_app() -> FastAPI:
 
     # Main router for the API.
     app.include_router(router=api_router, prefix="/api")
+    _assert_unique_routes(app)
 
     return app
@@ -1,8 +1,10 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
+from grpc import Compression
 from langfuse import Langfuse
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.aio_pika import AioPikaInstrumentor
@@ -18,12 +20,14 @@ from opentelemetry.sdk.resources import (
 )
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from opentelemetry.trace import set_tracer_provider
 from prometheus_fastapi_instrumentator.instrumentation import (
     PrometheusFastApiInstrumentator,
 )
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy import text
 
+from zentro.db.session_factory import engine, get_db_session_factory
 from zentro.services.rabbit.lifespan import init_rabbit, shutdown_rabbit
 from zentro.services.redis.lifespan import init_redis, shutdown_redis
 from zentro.settings import settings
@@ -38,19 +42,31 @@ def _setup_db(app: FastAPI) -> None:  # pragma: no cover
     """
     Creates connection to the database.
 
-    This function creates SQLAlchemy engine instance,
-    session_factory for creating sessions
-    and stores them in the application's state property.
+    This function stores the process-wide SQLAlchemy engine and its
+    session_factory in the application's state property. Agent tools use the
+    same engine outside of requests, so each process keeps a single pool.
 
     :param app: fastAPI application.
     """
-    engine = create_async_engine(str(settings.db_url), echo=settings.db_echo)
-    session_factory = async_sessionmaker(
-        engine,
-        expire_on_commit=False,
-    )
     app.state.db_engine = engine
-    app.state.db_session_factory = session_factory
+    app.state.db_session_factory = get_db_session_factory()
+
+
+async def _warm_db_pool(app: FastAPI) -> None:  # pragma: no cover
+    """
+    Opens ``db_pool_size`` connections up front.
+
+    Connections are checked out concurrently and returned to the pool, so the
+    first wave of requests doesn't pay for connecting to the database.
+
+    :param app: fastAPI application.
+    """
+
+    async def _connect() -> None:
+        async with app.state.db_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_connect() for _ in range(settings.db_pool_size)))
 
 
 def setup_opentelemetry(app: FastAPI) -> None:  # pragma: no cover
@@ -70,14 +86,22 @@ def setup_opentelemetry(app: FastAPI) -> None:  # pragma: no cover
                 DEPLOYMENT_ENVIRONMENT: settings.environment,
             },
         ),
+        sampler=ParentBased(TraceIdRatioBased(settings.opentelemetry_sample_rate)),
     )
 
+    # The SDK defaults (2048 queued spans, flushed every 5s in batches of 512)
+    # drop spans under load; a bigger queue flushed more often keeps up.
     tracer_provider.add_span_processor(
         BatchSpanProcessor(
             OTLPSpanExporter(
                 endpoint=settings.opentelemetry_endpoint,
                 insecure=True,
+                compression=Compression.Gzip,
             ),
+            max_queue_size=16384,
+            schedule_delay_millis=1000,
+            max_export_batch_size=2048,
+            export_timeout_millis=15000,
         ),
     )
 
@@ -202,15 +226,22 @@ async def lifespan_setup(
     """
 
     app.middleware_stack = None
-    if not broker.is_worker_process:
-        await broker.startup()
     _setup_db(app)
     setup_opentelemetry(app)
     setup_langfuse()
-    initialize_prompts()
-    await setup_checkpointer()
     init_redis(app)
     init_rabbit(app)
+    # The steps that talk to other services are independent; run them
+    # concurrently so startup takes as long as the slowest one.
+    # initialize_prompts is a blocking HTTP call, hence the thread.
+    startup_io = [
+        _warm_db_pool(app),
+        setup_checkpointer(),
+        asyncio.to_thread(initialize_prompts),
+    ]
+    if not broker.is_worker_process:
+        startup_io.append(broker.startup())
+    await asyncio.gather(*startup_io)
     setup_prometheus(app)
     app.middleware_stack = app.build_middleware_stack()
 